@@ -0,0 +1,144 @@
+"""
+Audio output profiles, shared by the game versions
+Call pre_init() before pygame.init() so the mixer opens with the profile's
+buffer size, sample rate and channel count. Run this file directly to see the
+buffer time and underruns a profile gets on this machine:
+
+    python audio_profile.py [profile] [--sweep]
+
+Output latency is not measured (that needs a loopback recording); the figure
+reported is an estimate derived from the negotiated buffer size.
+"""
+import os
+import struct
+import sys
+import time
+import pygame
+
+# Mixer settings as (frequency, size, channels, buffer); buffer is in sample frames
+AUDIO_PROFILES = {
+    "low_latency": (44100, -16, 2, 256),
+    "balanced": (44100, -16, 2, 512),
+    "safe": (44100, -16, 2, 1024)
+}
+# Profile used when AUDIO_PROFILE is not set in the environment
+DEFAULT_PROFILE = "low_latency"
+# Buffer sizes tried by --sweep, smallest first
+SWEEP_BUFFERS = (128, 256, 512, 1024, 2048)
+# struct codes for mixer sample sizes as reported by get_init(); negative sizes are
+# signed, and 32-bit samples are floats
+SAMPLE_CODES = {8: 'B', -8: 'b', 16: 'H', -16: 'h', 32: 'f', -32: 'f'}
+
+def get_profile(name=None):
+    """Mixer settings for a profile, with AUDIO_FREQUENCY/AUDIO_CHANNELS/AUDIO_BUFFER overrides"""
+    name = name or os.environ.get("AUDIO_PROFILE", DEFAULT_PROFILE)
+    if name not in AUDIO_PROFILES:
+        print(f"Unknown audio profile: {name}, using {DEFAULT_PROFILE}")
+        name = DEFAULT_PROFILE
+    frequency, size, channels, buffer = AUDIO_PROFILES[name]
+    try:
+        frequency = int(os.environ.get("AUDIO_FREQUENCY", frequency))
+        channels = int(os.environ.get("AUDIO_CHANNELS", channels))
+        buffer = int(os.environ.get("AUDIO_BUFFER", buffer))
+    except ValueError as e:
+        print(f"Error reading audio overrides: {e}")
+    return frequency, size, channels, buffer
+
+def pre_init(name=None):
+    """Configure the mixer before pygame.init(); returns the requested settings"""
+    profile = get_profile(name)
+    pygame.mixer.pre_init(*profile)
+    return profile
+
+def buffer_latency_ms(frequency, buffer):
+    """Time one mixer buffer takes to play"""
+    return buffer * 1000.0 / frequency
+
+def test_tone(frequency, size, channels, frames, level=0.12):
+    """A 440 Hz square wave in the mixer's sample format, as raw bytes"""
+    code = SAMPLE_CODES.get(size)
+    if code is None:
+        raise ValueError(f"Unsupported sample size: {size}")
+    if code == 'f':
+        high, low = level, -level
+    else:
+        full = 2 ** (abs(size) - 1) - 1
+        high, low = int(full * level), -int(full * level)
+        if size > 0:
+            # Unsigned samples are centred on the midpoint
+            high += full + 1
+            low += full + 1
+    half_period = max(1, frequency // 880)
+    # Native byte order, as SDL's default formats are
+    high_frame = struct.pack('=' + code * channels, *([high] * channels))
+    low_frame = struct.pack('=' + code * channels, *([low] * channels))
+    return b''.join(high_frame if (i // half_period) % 2 == 0 else low_frame for i in range(frames))
+
+def measure(profile, seconds=2.0, frame_ms=16):
+    """Open the mixer with a profile and feed it the way a game loop does
+
+    A tone is queued in pieces of a few buffers once per simulated frame. A gap
+    is counted whenever the channel runs dry before the next piece is queued,
+    which is what an underrun sounds like.
+    """
+    frequency, size, channels, buffer = profile
+    pygame.mixer.quit()
+    try:
+        pygame.mixer.init(frequency, size, channels, buffer)
+    except pygame.error as e:
+        return {"profile": profile, "error": str(e)}
+    actual = pygame.mixer.get_init()
+
+    # A short tone in the negotiated format, a few buffers long
+    try:
+        piece = pygame.mixer.Sound(buffer=test_tone(*actual, buffer * 4))
+    except ValueError as e:
+        return {"profile": profile, "error": str(e)}
+
+    channel = pygame.mixer.Channel(0)
+    channel.play(piece)
+    gaps = 0
+    queued = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        if not channel.get_busy():
+            gaps += 1
+            channel.play(piece)
+        elif channel.get_queue() is None:
+            channel.queue(piece)
+            queued += 1
+        time.sleep(frame_ms / 1000.0)
+    channel.stop()
+
+    return {
+        "profile": profile,
+        "negotiated": actual,
+        "buffer_ms": buffer_latency_ms(actual[0], buffer),
+        # Not measured: SDL double-buffers, so a new sound can wait up to two buffers
+        "estimated_latency_ms": 2 * buffer_latency_ms(actual[0], buffer),
+        "pieces": queued,
+        "underruns": gaps
+    }
+
+def report(result):
+    """Print one measurement"""
+    if "error" in result:
+        print(f"{result['profile']}: failed to open mixer ({result['error']})")
+        return
+    frequency, size, channels, buffer = result["profile"]
+    print(f"requested {frequency} Hz, {channels} ch, buffer {buffer}; negotiated {result['negotiated']}")
+    print(f"  buffer {result['buffer_ms']:.1f} ms, estimated output latency "
+          f"{result['estimated_latency_ms']:.1f} ms (two buffers, not measured), "
+          f"underruns {result['underruns']} over {result['pieces']} queued pieces")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    profile = get_profile(args[0] if args else None)
+    pygame.init()
+    if "--sweep" in sys.argv:
+        # Smallest buffer without underruns is the one to pick for this machine
+        for buffer in SWEEP_BUFFERS:
+            report(measure(profile[:3] + (buffer,)))
+    else:
+        report(measure(profile))
+    pygame.quit()
@@ -0,0 +1,195 @@
+"""
+Placeholder asset build shared by v1 and v2
+Each output is rebuilt only when it is missing or when the source of its recipe
+or its parameters changed since the last build, as recorded in a manifest next
+to the outputs. Changed assets are rendered in parallel worker processes.
+An existing file the manifest does not list was not made by this tool and is
+left alone unless --force is given.
+
+Usage: python build_assets.py [--force] [--jobs N] [target ...]
+"""
+import hashlib
+import inspect
+import json
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Keep worker processes quiet when they import pygame
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# Bump to force every asset to rebuild (e.g. when the output format changes)
+BUILD_VERSION = 1
+MANIFEST = '.build_manifest.json'
+
+# Raw, display-ready RGBA sidecars: magic, width, height, then the pixels
+SIDECAR_EXTENSION = '.rgba'
+SIDECAR_HEADER = struct.Struct('<4sHH')
+SIDECAR_MAGIC = b'RGBA'
+
+# Create placeholder images
+def create_player_image(pygame):
+    # Create a simple player character (cyberpunk style)
+    surface = pygame.Surface((32, 48), pygame.SRCALPHA)
+
+    # Body (dark blue)
+    pygame.draw.rect(surface, (20, 30, 80), (8, 8, 16, 32))
+
+    # Head
+    pygame.draw.circle(surface, (200, 200, 200), (16, 8), 8)
+
+    # Neon details (cyan)
+    pygame.draw.line(surface, (0, 255, 255), (8, 16), (24, 16), 2)
+    pygame.draw.line(surface, (0, 255, 255), (8, 24), (24, 24), 2)
+    pygame.draw.line(surface, (0, 255, 255), (8, 32), (24, 32), 2)
+
+    # Visor (neon pink)
+    pygame.draw.line(surface, (255, 0, 153), (12, 6), (20, 6), 2)
+
+    return surface
+
+def create_star_image(pygame):
+    # Create a star collectible
+    surface = pygame.Surface((32, 32), pygame.SRCALPHA)
+
+    # Star shape (yellow with neon glow)
+    points = [
+        (16, 0), (20, 12), (32, 12), (22, 20),
+        (26, 32), (16, 24), (6, 32), (10, 20),
+        (0, 12), (12, 12)
+    ]
+
+    # Glow effect
+    pygame.draw.polygon(surface, (255, 255, 100, 100), points, 0)
+
+    # Star outline
+    pygame.draw.polygon(surface, (255, 255, 0), points, 0)
+
+    # Inner details
+    pygame.draw.polygon(surface, (255, 255, 200), [
+        (16, 6), (18, 12), (24, 12), (19, 16),
+        (21, 22), (16, 18), (11, 22), (13, 16),
+        (8, 12), (14, 12)
+    ], 0)
+
+    return surface
+
+# Recipes by name, so worker processes can look them up
+RECIPES = {
+    'player': create_player_image,
+    'star': create_star_image
+}
+
+# Outputs per asset directory (relative to this file): file name -> (recipe, parameters)
+ASSETS = {
+    'player.png': ('player', {}),
+    'star.png': ('star', {})
+}
+# Asset directories to build, and whether they also get RGBA sidecars
+TARGETS = {
+    os.path.join('v1', 'assets'): False,
+    os.path.join('v2', 'assets'): True
+}
+
+def recipe_hash(recipe, params, sidecar):
+    """Hash of everything that determines an output: recipe source, parameters and format"""
+    source = inspect.getsource(RECIPES[recipe])
+    key = json.dumps([BUILD_VERSION, recipe, source, params, sidecar], sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def sidecar_path(path):
+    """Where the RGBA sidecar for an image is written"""
+    return os.path.splitext(path)[0] + SIDECAR_EXTENSION
+
+def render(recipe, params, path, sidecar):
+    """Worker: render one asset and write it (and its sidecar) to disk"""
+    import pygame
+    surface = RECIPES[recipe](pygame, **params)
+    pygame.image.save(surface, path)
+    if sidecar:
+        with open(sidecar_path(path), 'wb') as f:
+            f.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, *surface.get_size()))
+            f.write(pygame.image.tobytes(surface, 'RGBA'))
+    return path
+
+def read_manifest(directory):
+    """Hashes of the outputs last built in a directory"""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_manifest(directory, manifest):
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def stale_outputs(directory, sidecar, manifest, force=False):
+    """(name, recipe, params, hash) for every output that needs rebuilding, and
+    the paths of existing outputs skipped because this tool did not create them"""
+    stale = []
+    skipped = []
+    for name, (recipe, params) in ASSETS.items():
+        path = os.path.join(directory, name)
+        digest = recipe_hash(recipe, params, sidecar)
+        if not force and name not in manifest and os.path.exists(path):
+            # Not generated by this tool, so it belongs to the user
+            print(f"Skipping {path}: not built by this tool (use --force to replace it)")
+            skipped.append(path)
+            continue
+        missing = not os.path.exists(path) or (sidecar and not os.path.exists(sidecar_path(path)))
+        if force or missing or manifest.get(name) != digest:
+            stale.append((name, recipe, params, digest))
+    return stale, skipped
+
+def build(targets=TARGETS, force=False, jobs=None):
+    """Rebuild stale outputs in every target; returns the numbers of assets built and skipped"""
+    base = os.path.dirname(os.path.abspath(__file__))
+    work = []
+    skipped = 0
+    manifests = {}
+    for target, sidecar in targets.items():
+        directory = os.path.join(base, target)
+        os.makedirs(directory, exist_ok=True)
+        manifests[directory] = read_manifest(directory)
+        stale, user_owned = stale_outputs(directory, sidecar, manifests[directory], force)
+        skipped += len(user_owned)
+        for name, recipe, params, digest in stale:
+            work.append((directory, name, recipe, params, digest, sidecar))
+
+    # Nothing changed: no worker processes, no pygame
+    if not work:
+        return 0, skipped
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [(pool.submit(render, recipe, params, os.path.join(directory, name), sidecar), directory, name, digest)
+                   for directory, name, recipe, params, digest, sidecar in work]
+        for future, directory, name, digest in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error building {os.path.join(directory, name)}: {e}")
+                continue
+            manifests[directory][name] = digest
+            print(f"Built {os.path.relpath(os.path.join(directory, name), base)}")
+
+    for directory, manifest in manifests.items():
+        write_manifest(directory, manifest)
+    return len(work), skipped
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    force = '--force' in args
+    jobs = None
+    if '--jobs' in args:
+        jobs = int(args[args.index('--jobs') + 1])
+        del args[args.index('--jobs'):args.index('--jobs') + 2]
+    names = [arg for arg in args if not arg.startswith('--')]
+    targets = {target: sidecar for target, sidecar in TARGETS.items()
+               if not names or target in names or os.path.dirname(target) in names}
+    built, skipped = build(targets, force, jobs)
+    if skipped:
+        print(f"{built} built, {skipped} skipped (not built by this tool; use --force)")
+    else:
+        print(f"{built} assets built" if built else "Assets up to date")
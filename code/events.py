@@ -0,0 +1,82 @@
+"""
+Gameplay event queue
+The simulation step records what happened (jumps, landings, stomps, pickups,
+deaths) as typed events; audio, effects, replay and telemetry handle them in
+one batch per kind once the step is over. Events of a kind nobody subscribed
+to are dropped when emitted, so a headless simulation pays one dict lookup.
+"""
+from collections import namedtuple
+
+# Event kinds
+JUMP = 'jump'
+LAND = 'land'
+STOMP = 'stomp'
+PICKUP = 'pickup'
+DEATH = 'death'
+LEVEL_COMPLETE = 'level_complete'
+ALL_EVENTS = (JUMP, LAND, STOMP, PICKUP, DEATH, LEVEL_COMPLETE)
+
+# What happened and where; value is a score or similar amount, entity the
+# entity it happened to where the game has entities
+Event = namedtuple('Event', ['kind', 'x', 'y', 'value', 'entity'], defaults=(0, 0, 0, None))
+
+class EventQueue:
+    def __init__(self):
+        # kind -> handlers, each called with a list of that kind's events
+        self.handlers = {}
+        # kind -> events emitted since the last dispatch, for subscribed kinds only
+        self.pending = {}
+
+    def subscribe(self, handler, *kinds):
+        """Call handler(events) after each step in which any of kinds were emitted"""
+        for kind in kinds:
+            handlers = self.handlers.setdefault(kind, [])
+            if handler not in handlers:
+                handlers.append(handler)
+            self.pending.setdefault(kind, [])
+
+    def unsubscribe(self, handler, *kinds):
+        """Stop calling handler for kinds; kinds left without handlers are no longer queued"""
+        for kind in kinds:
+            handlers = self.handlers.get(kind)
+            if handlers and handler in handlers:
+                handlers.remove(handler)
+                if not handlers:
+                    del self.handlers[kind]
+                    del self.pending[kind]
+
+    def emit(self, kind, x=0, y=0, value=0, entity=None):
+        """Queue an event for the next dispatch, if anything handles its kind"""
+        batch = self.pending.get(kind)
+        if batch is not None:
+            batch.append(Event(kind, x, y, value, entity))
+
+    def dispatch(self):
+        """Hand each kind's queued events to its handlers, in subscription order
+
+        Events emitted by a handler are queued for the next dispatch, and handlers
+        may subscribe or unsubscribe while being called.
+        """
+        for kind, batch in list(self.pending.items()):
+            if batch and kind in self.pending:
+                self.pending[kind] = []
+                for handler in list(self.handlers.get(kind, ())):
+                    handler(batch)
+
+    def clear(self):
+        """Drop queued events without handling them"""
+        for batch in self.pending.values():
+            batch.clear()
+
+class EventCounter:
+    """Telemetry handler: how many events of each kind were handled"""
+    def __init__(self):
+        self.counts = {}
+
+    def __call__(self, events):
+        kind = events[0].kind
+        self.counts[kind] = self.counts.get(kind, 0) + len(events)
+
+    def summary(self):
+        """Counts as 'kind: n' pairs in a stable order"""
+        return ', '.join(f"{kind}: {self.counts[kind]}" for kind in sorted(self.counts)) or 'none'
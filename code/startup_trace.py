@@ -0,0 +1,104 @@
+"""
+Startup tracer, shared by the game versions
+Records a timed span for each init stage and asset load until the first frame
+is shown. Import it before pygame so the import itself is measured.
+
+    STARTUP_TRACE=trace.json   write the spans as a Chrome trace-event file
+                               (opens in chrome://tracing, Perfetto or speedscope)
+    STARTUP_BUDGET_MS=1500     assert mode: after the first frame, print the
+                               breakdown; the game then shuts down and exits with
+                               status 1 if cold start took longer than the budget,
+                               or 0 if it did not
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Origin of every timestamp: as close to process start as an import gets
+_origin = time.perf_counter()
+_spans = []
+_lock = threading.Lock()
+_finished = False
+
+@contextmanager
+def span(name, category='init'):
+    """Time a block as one span; does nothing once startup has finished"""
+    if _finished:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            _spans.append((name, category, start - _origin, end - start, threading.get_ident()))
+
+def elapsed_ms():
+    """Milliseconds since the tracer was imported"""
+    return (time.perf_counter() - _origin) * 1000
+
+def write_trace(path):
+    """Write the recorded spans as Chrome trace events"""
+    pid = os.getpid()
+    thread_ids = {}
+    events = []
+    for name, category, start, duration, thread in _spans:
+        events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round(start * 1e6),
+            'dur': round(duration * 1e6),
+            'pid': pid,
+            'tid': thread_ids.setdefault(thread, len(thread_ids))
+        })
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+def report(total_ms):
+    """Print the startup spans in start order"""
+    print(f"Startup: {total_ms:.1f} ms to first frame")
+    for name, category, start, duration, thread in sorted(_spans, key=lambda s: s[2]):
+        print(f"  {start * 1000:8.1f} ms  {duration * 1000:8.1f} ms  [{category}] {name}")
+
+def finish():
+    """Mark the first frame: write the trace and check the budget if configured
+
+    Returns None unless a budget is set; then returns the exit status the game
+    should shut down with (0 within budget, 1 over it, 2 for an invalid budget).
+    Later calls return None.
+    """
+    global _finished
+    if _finished:
+        return None
+    total_ms = elapsed_ms()
+    with _lock:
+        _spans.append(('first frame', 'init', 0.0, total_ms / 1000, threading.get_ident()))
+        _finished = True
+
+    trace_path = os.environ.get('STARTUP_TRACE')
+    budget = os.environ.get('STARTUP_BUDGET_MS')
+    if trace_path:
+        if trace_path == '1':
+            trace_path = 'startup_trace.json'
+        try:
+            write_trace(trace_path)
+            print(f"Startup trace written to {trace_path}")
+        except OSError as e:
+            print(f"Error writing startup trace: {e}")
+    if not budget:
+        return None
+    report(total_ms)
+    try:
+        budget_ms = float(budget)
+    except ValueError:
+        print(f"Invalid STARTUP_BUDGET_MS: {budget}")
+        return 2
+    if total_ms > budget_ms:
+        print(f"Startup budget exceeded: {total_ms:.1f} ms > {budget_ms:.1f} ms")
+        return 1
+    print(f"Startup within budget: {total_ms:.1f} ms <= {budget_ms:.1f} ms")
+    return 0
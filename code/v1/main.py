@@ -1,6 +1,7 @@
 import pygame
 import sys
 import random
+from collections import deque
 from pygame.locals import *
 
 # Initialize pygame
@@ -20,6 +21,10 @@ NEON_BLUE = (0, 195, 255)
 NEON_PINK = (255, 0, 153)
 NEON_GREEN = (57, 255, 20)
 
+# Cyberpunk background grid
+GRID_SIZE = 50
+GRID_COLOR = (20, 20, 40)
+
 # Create the screen
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption('Cyberpunk Platform Game')
@@ -27,6 +32,16 @@ pygame.display.set_caption('Cyberpunk Platform Game')
 # Clock for controlling the frame rate
 clock = pygame.time.Clock()
 
+# Render the background grid once; one cell wider than the screen so it can scroll
+def create_grid_texture():
+    surface = pygame.Surface((SCREEN_WIDTH + GRID_SIZE, SCREEN_HEIGHT)).convert()
+    surface.fill(BLACK)
+    for x in range(0, SCREEN_WIDTH + GRID_SIZE, GRID_SIZE):
+        pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, SCREEN_HEIGHT), 1)
+    for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
+        pygame.draw.line(surface, GRID_COLOR, (0, y), (SCREEN_WIDTH + GRID_SIZE, y), 1)
+    return surface
+
 # Player class
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -47,7 +62,8 @@ class Player(pygame.sprite.Sprite):
         self.direction = 0
         self.in_air = True
 
-    def update(self, platforms):
+    def update(self, platforms, scroll_x=0):
+        # The player is kept in screen space; platforms are in world space, scroll_x apart
         dx = 0
         dy = 0
         
@@ -76,11 +92,11 @@ class Player(pygame.sprite.Sprite):
         self.in_air = True
         for platform in platforms:
             # Check for collision in x direction
-            if platform.rect.colliderect(self.rect.x + dx, self.rect.y, self.width, self.height):
+            if platform.rect.colliderect(self.rect.x + scroll_x + dx, self.rect.y, self.width, self.height):
                 dx = 0
                 
             # Check for collision in y direction
-            if platform.rect.colliderect(self.rect.x, self.rect.y + dy, self.width, self.height):
+            if platform.rect.colliderect(self.rect.x + scroll_x, self.rect.y + dy, self.width, self.height):
                 # Check if below platform (jumping)
                 if self.vel_y < 0:
                     dy = platform.rect.bottom - self.rect.top
@@ -159,24 +175,39 @@ class World():
         self.star_list = pygame.sprite.Group()
         self.score = 0
         
-    def draw(self, surface):
-        self.platform_list.draw(surface)
-        self.star_list.draw(surface)
+        # Entities keep fixed world coordinates; only the view position moves
+        self.scroll_x = 0
+        self.last_platform_right = 0
         
-    def update(self, scroll):
-        # Update platform positions
+        # Entities in spawn order (left to right), so despawning only checks the front
+        self.platform_queue = deque()
+        self.star_queue = deque()
+        
+    def draw(self, surface):
         for platform in self.platform_list:
-            platform.rect.x -= scroll
-            # Remove platforms that have gone off screen
-            if platform.rect.right < 0:
-                platform.kill()
-                
-        # Update star positions
+            surface.blit(platform.image, (platform.rect.x - self.scroll_x, platform.rect.y))
         for star in self.star_list:
-            star.rect.x -= scroll
-            # Remove stars that have gone off screen
-            if star.rect.right < 0:
-                star.kill()
+            surface.blit(star.image, (star.rect.x - self.scroll_x, star.rect.y))
+        
+    def add_platform(self, platform):
+        self.platform_list.add(platform)
+        self.platform_queue.append(platform)
+        self.last_platform_right = max(self.last_platform_right, platform.rect.right)
+        
+    def add_star(self, star):
+        self.star_list.add(star)
+        self.star_queue.append(star)
+        
+    def update(self, scroll):
+        self.scroll_x += scroll
+        
+        # Remove platforms that have gone off screen
+        while self.platform_queue and self.platform_queue[0].rect.right < self.scroll_x:
+            self.platform_queue.popleft().kill()
+            
+        # Remove stars that have gone off screen or were collected
+        while self.star_queue and (not self.star_queue[0].alive() or self.star_queue[0].rect.right < self.scroll_x):
+            self.star_queue.popleft().kill()
 
 # Function to generate platforms
 def generate_platforms(world, start_x, width=100):
@@ -184,12 +215,12 @@ def generate_platforms(world, start_x, width=100):
     y = random.randint(SCREEN_HEIGHT // 2, SCREEN_HEIGHT - 100)
     platform_type = random.randint(1, 3)
     platform = Platform(start_x, y, width, 20, platform_type)
-    world.platform_list.add(platform)
+    world.add_platform(platform)
     
     # Randomly add a star above the platform
     if random.random() < 0.7:  # 70% chance to spawn a star
         star = Star(start_x + width // 2, y - 50)
-        world.star_list.add(star)
+        world.add_star(star)
     
     return platform
 
@@ -217,20 +248,15 @@ def main():
     game_over = False
     score = 0
     font = pygame.font.SysFont('Arial', 30)
+    grid_texture = create_grid_texture()
     
     # Main game loop
     running = True
     while running:
         clock.tick(FPS)
         
-        # Draw cyberpunk background
-        screen.fill(BLACK)
-        
-        # Draw grid lines for cyberpunk effect
-        for x in range(0, SCREEN_WIDTH, 50):
-            pygame.draw.line(screen, (20, 20, 40), (x - bg_scroll % 50, 0), (x - bg_scroll % 50, SCREEN_HEIGHT), 1)
-        for y in range(0, SCREEN_HEIGHT, 50):
-            pygame.draw.line(screen, (20, 20, 40), (0, y), (SCREEN_WIDTH, y), 1)
+        # Draw cyberpunk background; the opaque grid texture also clears the screen
+        screen.blit(grid_texture, (-(bg_scroll % GRID_SIZE), 0))
         
         # Draw world
         world.draw(screen)
@@ -239,12 +265,14 @@ def main():
         player_group.draw(screen)
         
         # Update player
-        scroll = player.update(world.platform_list)
+        scroll = player.update(world.platform_list, world.scroll_x)
         
-        # Check if player has collected any stars
-        hits = pygame.sprite.spritecollide(player, world.star_list, True)
-        for hit in hits:
-            score += 1
+        # Check if player has collected any stars (in world coordinates)
+        player_x = player.rect.x + world.scroll_x
+        for star in world.star_list:
+            if star.rect.colliderect(player_x, player.rect.y, player.width, player.height):
+                star.kill()
+                score += 1
         
         # Display score
         score_text = font.render(f'Stars: {score}', True, WHITE)
@@ -255,10 +283,9 @@ def main():
         
         # Generate new platforms as player moves right
         if len(world.platform_list) < 10:
-            last_platform = max([p.rect.right for p in world.platform_list])
             gap = random.randint(50, 200)
             width = random.randint(80, 150)
-            generate_platforms(world, last_platform + gap, width)
+            generate_platforms(world, world.last_platform_right + gap, width)
         
         # Event handling
         for event in pygame.event.get():
@@ -0,0 +1,96 @@
+import os
+import struct
+import threading
+import time
+
+import pygame
+import startup_trace
+
+# Raw RGBA sidecars written next to images by code/build_assets.py
+SIDECAR_EXTENSION = '.rgba'
+SIDECAR_HEADER = struct.Struct('<4sHH')
+SIDECAR_MAGIC = b'RGBA'
+
+class AssetCache:
+    def __init__(self, base_dir='assets'):
+        """Loads each image once per process and shares the surface between callers"""
+        self.base_dir = base_dir
+        self.images = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        # Seconds spent loading and converting each image, by name
+        self.load_times = {}
+        # Images that could not be loaded, with the reason
+        self.missing = {}
+
+    def image(self, name, fallback=None):
+        """Return the converted image for name, or fallback() if it cannot be loaded
+
+        Both the loaded image and the fallback are cached, so a missing file is only
+        looked for once. The surface is shared and must not be drawn on.
+        """
+        with self.lock:
+            surface = self.images.get(name)
+            if surface is not None:
+                self.hits += 1
+                return surface
+
+        path = os.path.join(self.base_dir, name)
+        start = time.perf_counter()
+        with startup_trace.span(path, 'asset'):
+            try:
+                surface = self._load_sidecar(path)
+                if surface is None:
+                    surface = pygame.image.load(path)
+                if pygame.display.get_surface() is not None:
+                    surface = surface.convert_alpha()
+            except (pygame.error, FileNotFoundError) as e:
+                if fallback is None:
+                    raise
+                print(f"Error loading image {path}: {e}; using fallback")
+                with self.lock:
+                    self.missing[name] = str(e)
+                surface = fallback()
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            # Another thread may have loaded it meanwhile; keep the first copy
+            if name in self.images:
+                return self.images[name]
+            self.images[name] = surface
+            self.load_times[name] = elapsed
+        return surface
+
+    @staticmethod
+    def _load_sidecar(path):
+        """Load the pre-decoded RGBA sidecar for an image, or None if there is no fresh one"""
+        sidecar = os.path.splitext(path)[0] + SIDECAR_EXTENSION
+        try:
+            # A sidecar older than its image is stale (the image was replaced by hand)
+            if os.path.exists(path) and os.path.getmtime(sidecar) < os.path.getmtime(path):
+                return None
+            with open(sidecar, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        # Truncated or empty sidecars are stale too
+        if len(data) < SIDECAR_HEADER.size:
+            return None
+        magic, width, height = SIDECAR_HEADER.unpack_from(data)
+        if magic != SIDECAR_MAGIC or len(data) != SIDECAR_HEADER.size + width * height * 4:
+            return None
+        return pygame.image.frombytes(data[SIDECAR_HEADER.size:], (width, height), 'RGBA')
+
+    def clear(self):
+        """Drop every cached image"""
+        with self.lock:
+            self.images.clear()
+
+    def stats(self):
+        """Load counts and timings, suitable for logging"""
+        return {
+            'loads': len(self.load_times),
+            'hits': self.hits,
+            'missing': len(self.missing),
+            'load_ms': sum(self.load_times.values()) * 1000
+        }
@@ -1,66 +0,0 @@
-import pygame
-import os
-
-# Initialize pygame
-pygame.init()
-
-# Create placeholder images
-def create_player_image():
-    # Create a simple player character (cyberpunk style)
-    surface = pygame.Surface((32, 48), pygame.SRCALPHA)
-    
-    # Body (dark blue)
-    pygame.draw.rect(surface, (20, 30, 80), (8, 8, 16, 32))
-    
-    # Head
-    pygame.draw.circle(surface, (200, 200, 200), (16, 8), 8)
-    
-    # Neon details (cyan)
-    pygame.draw.line(surface, (0, 255, 255), (8, 16), (24, 16), 2)
-    pygame.draw.line(surface, (0, 255, 255), (8, 24), (24, 24), 2)
-    pygame.draw.line(surface, (0, 255, 255), (8, 32), (24, 32), 2)
-    
-    # Visor (neon pink)
-    pygame.draw.line(surface, (255, 0, 153), (12, 6), (20, 6), 2)
-    
-    return surface
-
-def create_star_image():
-    # Create a star collectible
-    surface = pygame.Surface((32, 32), pygame.SRCALPHA)
-    
-    # Star shape (yellow with neon glow)
-    points = [
-        (16, 0), (20, 12), (32, 12), (22, 20),
-        (26, 32), (16, 24), (6, 32), (10, 20),
-        (0, 12), (12, 12)
-    ]
-    
-    # Glow effect
-    pygame.draw.polygon(surface, (255, 255, 100, 100), points, 0)
-    
-    # Star outline
-    pygame.draw.polygon(surface, (255, 255, 0), points, 0)
-    
-    # Inner details
-    pygame.draw.polygon(surface, (255, 255, 200), [
-        (16, 6), (18, 12), (24, 12), (19, 16),
-        (21, 22), (16, 18), (11, 22), (13, 16),
-        (8, 12), (14, 12)
-    ], 0)
-    
-    return surface
-
-# Save the images
-if not os.path.exists('player.png'):
-    player_img = create_player_image()
-    pygame.image.save(player_img, 'player.png')
-    print("Created player.png")
-
-if not os.path.exists('star.png'):
-    star_img = create_star_image()
-    pygame.image.save(star_img, 'star.png')
-    print("Created star.png")
-
-pygame.quit()
-print("Placeholder images created successfully!")
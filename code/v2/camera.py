@@ -1,36 +1,98 @@
 import pygame
 
 class Camera:
-    def __init__(self, width, height):
+    def __init__(self, width, height, dead_zone=(0, 0), smooth_time=0):
         self.camera = pygame.Rect(0, 0, width, height)
         self.width = width
         self.height = height
         self.offset_x = 0
         self.offset_y = 0
-        
+
+        # View position (top-left, world coordinates) and its velocity for smoothing
+        self.x = 0.0
+        self.y = 0.0
+        self.vel_x = 0.0
+        self.vel_y = 0.0
+
+        # The target can move this far (width, height) around the view centre
+        # before the camera starts following it
+        self.dead_zone_width, self.dead_zone_height = dead_zone
+        # Roughly the number of frames the camera takes to catch up; 0 snaps
+        self.smooth_time = smooth_time
+
+        # Updated in place every frame so callers can hold on to them
+        self.visible_world_rect = pygame.Rect(0, 0, width, height)
+        self.offset = [0, 0]
+
     def apply(self, entity):
         """Returns the entity's rectangle offset by camera position"""
         return entity.rect.move(self.camera.topleft)
-    
+
     def apply_rect(self, rect):
         """Returns a rectangle offset by camera position"""
         return rect.move(self.camera.topleft)
-        
-    def update(self, target):
+
+    def snap_to(self, target):
+        """Centre the camera on the target immediately"""
+        self.x = target.rect.centerx - self.width / 2
+        self.y = target.rect.centery - self.height / 2
+        self.vel_x = 0.0
+        self.vel_y = 0.0
+        self._sync()
+
+    def update(self, target, dt=1.0):
         """Updates camera position based on target entity"""
-        # Track target horizontally with smooth movement
-        x = -target.rect.centerx + int(self.width / 2)
-        y = -target.rect.centery + int(self.height / 2)
-        
-        # Limit scrolling to game world
-        # x = min(0, x)  # left
-        # x = max(-(self.width), x)  # right
-        # y = min(0, y)  # top
-        # y = max(-(self.height), y)  # bottom
-        
-        # Apply camera position with smooth movement
-        self.camera = pygame.Rect(x, y, self.width, self.height)
-        
+        # Only move when the target leaves the dead zone around the view centre
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        goal_x = self._follow(center_x, target.rect.centerx, self.dead_zone_width / 2)
+        goal_y = self._follow(center_y, target.rect.centery, self.dead_zone_height / 2)
+
+        # Ease towards the goal with a critically damped spring
+        center_x, self.vel_x = self._smooth_damp(center_x, goal_x, self.vel_x, dt)
+        center_y, self.vel_y = self._smooth_damp(center_y, goal_y, self.vel_y, dt)
+        self.x = center_x - self.width / 2
+        self.y = center_y - self.height / 2
+        self._sync()
+
+    def is_visible(self, rect, margin=0):
+        """Whether a world-space rect overlaps the view, optionally grown by margin"""
+        view = self.visible_world_rect
+        return (rect.right + margin > view.left and rect.left - margin < view.right and
+                rect.bottom + margin > view.top and rect.top - margin < view.bottom)
+
+    @staticmethod
+    def _follow(center, target, half_zone):
+        """Goal position that brings the target back to the edge of the dead zone"""
+        if target > center + half_zone:
+            return target - half_zone
+        if target < center - half_zone:
+            return target + half_zone
+        return center
+
+    def _smooth_damp(self, current, goal, velocity, dt):
+        """Critically damped step towards goal; returns (position, velocity)"""
+        if self.smooth_time <= 0:
+            return goal, 0.0
+        omega = 2.0 / self.smooth_time
+        x = omega * dt
+        decay = 1.0 / (1.0 + x + 0.48 * x * x + 0.235 * x * x * x)
+        change = current - goal
+        temp = (velocity + omega * change) * dt
+        velocity = (velocity - omega * temp) * decay
+        return goal + (change + temp) * decay, velocity
+
+    def _sync(self):
+        """Write the current position into the shared rects and offset without allocating"""
+        x = int(round(self.x))
+        y = int(round(self.y))
+        self.camera.x = -x
+        self.camera.y = -y
+        self.visible_world_rect.x = x
+        self.visible_world_rect.y = y
+        self.offset[0] = x
+        self.offset[1] = y
+
         # Store offset for parallax effects
-        self.offset_x = x
-        self.offset_y = y
+        self.offset_x = -x
+        self.offset_y = -y
@@ -0,0 +1,76 @@
+import pygame
+
+class GlowText:
+    def __init__(self, font, position, color, template='{}', value=None, glow_steps=5, padding=5):
+        """A line of text with a glowing backdrop, re-rendered only when its value changes"""
+        self.font = font
+        self.position = position
+        self.color = color
+        self.template = template
+        self.glow_steps = glow_steps
+        self.padding = padding
+        self.value = value
+        self.surface = None
+        self.rect = pygame.Rect(position, (0, 0))
+        self.dirty = True
+
+    def set_value(self, value):
+        """Update the displayed value; does nothing if it has not changed"""
+        if value != self.value:
+            self.value = value
+            self.dirty = True
+
+    def render(self):
+        """Render text and glow into the widget's cached surface"""
+        text = self.font.render(self.template.format(self.value), True, self.color)
+        pad = self.padding
+        self.surface = pygame.Surface((text.get_width() + pad * 2, text.get_height() + pad * 2), pygame.SRCALPHA)
+        glow_rect = self.surface.get_rect()
+        for i in range(self.glow_steps, 0, -1):
+            alpha = 50 - i * 10
+            pygame.draw.rect(self.surface, (*self.color, alpha),
+                             glow_rect.inflate(-i * 2, -i * 2), border_radius=3)
+        self.surface.blit(text, (pad, pad))
+        self.rect = self.surface.get_rect(topleft=(self.position[0] - pad, self.position[1] - pad))
+        self.dirty = False
+
+class Hud:
+    def __init__(self):
+        """HUD widgets composited into one overlay that is rebuilt only when a widget changes"""
+        self.widgets = []
+        self.overlay = None
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+        self.rebuilds = 0
+
+    def add(self, widget):
+        """Add a widget; it is drawn in the order added"""
+        self.widgets.append(widget)
+        self.overlay = None
+        return widget
+
+    def draw(self, surface):
+        """Blit the HUD, rebuilding the overlay first if any widget changed"""
+        if self.overlay is None or any(widget.dirty for widget in self.widgets):
+            self._rebuild()
+        if self.overlay is not None:
+            surface.blit(self.overlay, self.overlay_rect)
+
+    def _rebuild(self):
+        """Re-render changed widgets and composite all of them into the overlay"""
+        for widget in self.widgets:
+            if widget.dirty or widget.surface is None:
+                widget.render()
+        if not self.widgets:
+            self.overlay = None
+            return
+
+        bounds = self.widgets[0].rect.unionall([widget.rect for widget in self.widgets[1:]])
+        # Reuse the overlay unless the widgets grew past it
+        if self.overlay is None or bounds.size != self.overlay.get_size():
+            self.overlay = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        else:
+            self.overlay.fill((0, 0, 0, 0))
+        self.overlay_rect = bounds
+        for widget in self.widgets:
+            self.overlay.blit(widget.surface, (widget.rect.x - bounds.x, widget.rect.y - bounds.y))
+        self.rebuilds += 1
@@ -1,22 +1,37 @@
-import pygame
-import sys
-import random
-import math
 import os
-from pygame.locals import *
-from camera import Camera
-from sound_manager import SoundManager
-from visual_effects import VisualEffects
+import sys
+# Modules shared by every version live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import startup_trace  # First after the path, so the rest of startup is measured
+with startup_trace.span('imports'):
+    import pygame
+    import sys
+    import random
+    import math
+    import os
+    from pygame.locals import *
+    from camera import Camera
+    from sound_manager import SoundManager
+    from visual_effects import VisualEffects
+    from quality_governor import QualityGovernor
+    from world_chunks import ChunkManager
+    from asset_cache import AssetCache
+    from hud import Hud, GlowText
+    from events import EventQueue, EventCounter, ALL_EVENTS, JUMP, LAND, PICKUP
+    import audio_profile
 
-# Initialize pygame
-pygame.init()
+# Initialize pygame, opening the mixer with the configured audio profile
+with startup_trace.span('pygame.init'):
+    audio_profile.pre_init()
+    pygame.init()
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 GRAVITY = 0.75
-SCROLL_THRESHOLD = 200
+LIGHTMAP_SCALE = 1  # Lighting resolution divisor: 1 = full, 2 = half, 4 = quarter
+ADAPTIVE_QUALITY = True  # Let the quality governor scale effects to hold FPS (overrides LIGHTMAP_SCALE)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -26,32 +41,100 @@ NEON_PINK = (255, 0, 153)
 NEON_GREEN = (57, 255, 20)
 NEON_PURPLE = (180, 0, 255)
 NEON_YELLOW = (255, 255, 0)
+COLORKEY = (255, 0, 255)  # Transparent colour for pre-converted opaque layers
+
+# Platform colours per type: (face, highlight, shadow)
+PLATFORM_COLORS = {
+    1: (NEON_BLUE, (100, 220, 255), (0, 100, 150)),
+    2: (NEON_PINK, (255, 100, 200), (150, 0, 100)),
+    3: (NEON_GREEN, (150, 255, 150), (0, 150, 50))
+}
+
+# Parallax layers at or below this speed are pre-composited into one strip
+FAR_LAYER_SPEED = 0.5
+
+# Star animation
+STAR_ROTATION_FRAMES = 90  # Pre-rendered rotation frames (4 degrees apart)
+STAR_BOB_STEPS = 128  # Samples per bob cycle
+STAR_BOB_HEIGHT = 5
+STAR_BOB = [math.sin(2 * math.pi * i / STAR_BOB_STEPS) * STAR_BOB_HEIGHT for i in range(STAR_BOB_STEPS)]
+
+# Camera
+CAMERA_DEAD_ZONE = (120, 80)  # How far the player can move before the camera follows
+CAMERA_SMOOTH_TIME = 8  # Roughly how many frames the camera takes to catch up
+
+# World streaming
+WORLD_SEED = None  # Set to an integer to replay the same world; None picks one per run
+CHUNK_WIDTH = 800
+PLATFORM_SLOT = 200  # Each chunk holds one platform per slot
+START_PLATFORM_WIDTH = 200
+PLATFORM_WIDTH_STEP = 10  # Platform widths are multiples of this so surfaces can be shared
+PATTERN_VARIANTS = 4  # Circuit patterns per platform type and width
+
+# Cyberpunk background grid
+GRID_SIZE = 50
+GRID_COLOR = (20, 20, 40)
 
 # Create the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Cyberpunk Platform Game - Enhanced')
+with startup_trace.span('set_mode'):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption('Cyberpunk Platform Game - Enhanced')
 
 # Clock for controlling the frame rate
 clock = pygame.time.Clock()
 
-# Initialize camera, sound manager, and visual effects
-camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
-sound_manager = SoundManager()
-visual_effects = VisualEffects(SCREEN_WIDTH, SCREEN_HEIGHT)
+# Initialize camera, sound manager, visual effects, quality governor and asset cache
+camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, CAMERA_DEAD_ZONE, CAMERA_SMOOTH_TIME)
+with startup_trace.span('SoundManager()'):
+    sound_manager = SoundManager()
+with startup_trace.span('VisualEffects()'):
+    visual_effects = VisualEffects(SCREEN_WIDTH, SCREEN_HEIGHT, LIGHTMAP_SCALE)
+quality_governor = QualityGovernor(FPS)
+assets = AssetCache('assets')
+
+# Sound effect voices: group, priority, simultaneous instances and minimum gap between plays
+sound_manager.configure_sound('jump', 'player', priority=2, max_voices=1, cooldown_ms=80)
+sound_manager.configure_sound('land', 'player', priority=1, max_voices=1, cooldown_ms=120)
+sound_manager.configure_sound('collect', 'pickups', priority=3, max_voices=3, cooldown_ms=40)
+
+# Particle emitters, each with its own share of the particle pool
+visual_effects.add_emitter('jump_dust', NEON_BLUE, size=(2, 4), speed=(1, 3), lifetime=(20, 40),
+                           direction=((-1, 1), (-2, 0)), budget=80, priority=2)
+visual_effects.add_emitter('landing', WHITE, size=(1, 3), speed=(0.5, 2), lifetime=(10, 30),
+                           direction=((-2, 2), (-0.5, 0)), budget=64, priority=2)
+visual_effects.add_emitter('trail', NEON_BLUE + (100,), size=(1, 3), speed=(0.5, 0.5), lifetime=(10, 20),
+                           budget=48, priority=0)
+visual_effects.add_emitter('pickup_burst', NEON_YELLOW, size=(2, 5), speed=(1, 3), lifetime=(20, 40),
+                           budget=120, priority=3)
+
+# Sound (name, volume) and particle burst (emitter, count) for each kind of gameplay event
+EVENT_SOUNDS = {JUMP: ('jump', 0.4), LAND: ('land', 0.3), PICKUP: ('collect', 0.5)}
+EVENT_PARTICLES = {JUMP: ('jump_dust', 10), LAND: ('landing', 8), PICKUP: ('pickup_burst', 15)}
+
+def play_event_sounds(events):
+    """Audio handler: one sound per kind of event each frame, however many happened"""
+    name, volume = EVENT_SOUNDS[events[0].kind]
+    sound_manager.play_sound(name, volume)
+
+def emit_event_particles(events):
+    """Effects handler: a particle burst where each event happened"""
+    emitter, count = EVENT_PARTICLES[events[0].kind]
+    for event in events:
+        visual_effects.emit(emitter, event.x, event.y, count)
+
+# Gameplay events, handled once per frame after the simulation step
+game_events = EventQueue()
+event_counts = EventCounter()
+game_events.subscribe(event_counts, *ALL_EVENTS)
+game_events.subscribe(play_event_sounds, *EVENT_SOUNDS)
+game_events.subscribe(emit_event_particles, *EVENT_PARTICLES)
 
 # Player class
 class Player(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        # Try to load player image, fall back to drawing if not available
-        try:
-            self.image = pygame.image.load(os.path.join('assets', 'player.png')).convert_alpha()
-        except:
-            # Create a simple player character
-            self.image = pygame.Surface((32, 48), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, NEON_BLUE, (8, 8, 16, 32))
-            pygame.draw.circle(self.image, WHITE, (16, 8), 8)
-            pygame.draw.line(self.image, NEON_PINK, (12, 6), (20, 6), 2)
+        # Load player image once per process, fall back to drawing if not available
+        self.image = assets.image('player.png', draw_player_image)
         
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -65,14 +148,9 @@ class Player(pygame.sprite.Sprite):
         self.in_air = True
         self.last_ground_y = y
         
-        # Animation variables
-        self.jumping_frame = 0
-        self.running_frame = 0
-        self.frame_timer = 0
-        
         # Add light source to player
-        visual_effects.add_light_source(x + self.width // 2, y + self.height // 2, 
-                                       100, NEON_BLUE, 0.6)
+        self.light = visual_effects.add_light_source(x + self.width // 2, y + self.height // 2, 
+                                                    100, NEON_BLUE, 0.6)
 
     def update(self, platforms):
         dx = 0
@@ -102,17 +180,7 @@ class Player(pygame.sprite.Sprite):
             self.jumped = True
             self.in_air = True
             self.last_ground_y = self.rect.y
-            # Play jump sound
-            sound_manager.play_sound('jump', 0.4)
-            
-            # Add jump particles
-            for _ in range(10):
-                visual_effects.add_particle(
-                    self.rect.centerx, self.rect.bottom,
-                    NEON_BLUE, random.randint(2, 4), 
-                    random.uniform(1, 3), random.randint(20, 40),
-                    (random.uniform(-1, 1), random.uniform(-2, 0))
-                )
+            game_events.emit(JUMP, self.rect.centerx, self.rect.bottom)
                 
         if not key[K_SPACE]:
             self.jumped = False
@@ -143,17 +211,9 @@ class Player(pygame.sprite.Sprite):
                     self.vel_y = 0
                     self.in_air = False
                     
-                    # If we just landed, play sound and add particles
-                    if self.rect.y - self.last_ground_y > 10:  # Only if falling from height
-                        sound_manager.play_sound('land', 0.3)
-                        # Add landing particles
-                        for _ in range(8):
-                            visual_effects.add_particle(
-                                self.rect.centerx, self.rect.bottom,
-                                WHITE, random.randint(1, 3),
-                                random.uniform(0.5, 2), random.randint(10, 30),
-                                (random.uniform(-2, 2), random.uniform(-0.5, 0))
-                            )
+                    # Only count it as a landing if falling from height
+                    if self.rect.y - self.last_ground_y > 10:
+                        game_events.emit(LAND, self.rect.centerx, self.rect.bottom)
         
         # Update player position
         self.rect.x += dx
@@ -169,123 +229,137 @@ class Player(pygame.sprite.Sprite):
             self.in_air = False
             
         # Update player's light source position
-        for light in visual_effects.light_sources:
-            if light['color'] == NEON_BLUE:  # Identify player's light
-                light['x'] = self.rect.centerx
-                light['y'] = self.rect.centery
+        self.light['x'] = self.rect.centerx
+        self.light['y'] = self.rect.centery
                 
         # Add motion trail particles
         if random.random() < 0.2:
-            visual_effects.add_particle(
-                self.rect.centerx, self.rect.centery,
-                NEON_BLUE + (100,), random.randint(1, 3),
-                0.5, random.randint(10, 20)
-            )
+            visual_effects.emit('trail', self.rect.centerx, self.rect.centery)
             
-        # Update animation frames
-        self.frame_timer += 1
-        if self.frame_timer > 5:
-            self.frame_timer = 0
-            if self.in_air:
-                self.jumping_frame = (self.jumping_frame + 1) % 4
-            else:
-                self.running_frame = (self.running_frame + 1) % 6
-                
         return dx
 
 # Platform class
 class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height, platform_type=1):
+    def __init__(self, x, y, width, height, platform_type=1, has_light=None, image=None, pattern=None):
         super().__init__()
         self.platform_type = platform_type
         self.width = width
         self.height = height
+        color = PLATFORM_COLORS.get(platform_type, PLATFORM_COLORS[3])[0]
         
-        # Create 3D platform with visual effects
-        if platform_type == 1:
-            color = NEON_BLUE
-            highlight = (100, 220, 255)
-            shadow = (0, 100, 150)
-        elif platform_type == 2:
-            color = NEON_PINK
-            highlight = (255, 100, 200)
-            shadow = (150, 0, 100)
-        else:
-            color = NEON_GREEN
-            highlight = (150, 255, 150)
-            shadow = (0, 150, 50)
-            
-        # Create 3D platform surface
-        self.image = visual_effects.create_3d_platform(
-            width, height, color, highlight, shadow, 10
-        )
+        # Create 3D platform surface unless it was rendered ahead of time
+        if image is None:
+            image = render_platform(width, height, platform_type, pattern)
+        self.image = image
             
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         
         # Add light source to some platforms
-        if random.random() < 0.3:
-            visual_effects.add_light_source(
+        if has_light is None:
+            has_light = random.random() < 0.3
+        self.light = None
+        if has_light:
+            self.light = visual_effects.add_light_source(
                 x + width // 2, y + height // 2,
                 70, color, 0.4
             )
 
 # Star class (replacing traditional coins)
 class Star(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=random, image=None):
         super().__init__()
-        # Try to load star image, fall back to drawing if not available
-        try:
-            self.image = pygame.image.load(os.path.join('assets', 'star.png')).convert_alpha()
-        except:
-            # Create a star collectible
-            self.image = pygame.Surface((32, 32), pygame.SRCALPHA)
-            # Star shape
-            points = [
-                (16, 0), (20, 12), (32, 12), (22, 20),
-                (26, 32), (16, 24), (6, 32), (10, 20),
-                (0, 12), (12, 12)
-            ]
-            pygame.draw.polygon(self.image, NEON_YELLOW, points, 0)
+        if image is None:
+            image = load_star_image()
+        self.image = image
         
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
         
-        # Animation variables
-        self.float_offset = random.uniform(0, math.pi * 2)
-        self.float_speed = random.uniform(0.05, 0.1)
+        # Animation variables, as positions in the STAR_BOB table
+        self.float_offset = rng.uniform(0, STAR_BOB_STEPS)
+        self.float_speed = rng.uniform(0.05, 0.1) * STAR_BOB_STEPS / (math.pi * 2)
         self.original_y = y
         self.angle = 0
         
+        # Chunk bookkeeping, filled in when spawned by the chunk manager
+        self.chunk = None
+        self.key = None
+        
         # Add light source to star
-        visual_effects.add_light_source(x, y, 50, NEON_YELLOW, 0.5)
+        self.light = visual_effects.add_light_source(x, y, 50, NEON_YELLOW, 0.5)
 
     def update(self):
         # Make star float up and down
-        self.float_offset += self.float_speed
-        self.rect.y = self.original_y + math.sin(self.float_offset) * 5
+        self.float_offset = (self.float_offset + self.float_speed) % STAR_BOB_STEPS
+        self.rect.y = self.original_y + STAR_BOB[int(self.float_offset)]
         
         # Rotate star
         self.angle = (self.angle + 1) % 360
         
         # Update star's light position
-        for light in visual_effects.light_sources:
-            if light['color'] == NEON_YELLOW and abs(light['x'] - self.rect.centerx) < 10:
-                light['x'] = self.rect.centerx
-                light['y'] = self.rect.centery
+        self.light['x'] = self.rect.centerx
+        self.light['y'] = self.rect.centery
+
+# Get the 3D surface for a platform, shared with every platform of the same variant
+def render_platform(width, height, platform_type, pattern=None):
+    if pattern is None:
+        pattern = random.randrange(PATTERN_VARIANTS)
+    color, highlight, shadow = PLATFORM_COLORS.get(platform_type, PLATFORM_COLORS[3])
+    return visual_effects.cached_3d_platform(
+        (platform_type, width, height, pattern), width, height, color, highlight, shadow, 10, pattern
+    )
+
+# Create a simple player character when player.png is not available
+def draw_player_image():
+    image = pygame.Surface((32, 48), pygame.SRCALPHA)
+    pygame.draw.rect(image, NEON_BLUE, (8, 8, 16, 32))
+    pygame.draw.circle(image, WHITE, (16, 8), 8)
+    pygame.draw.line(image, NEON_PINK, (12, 6), (20, 6), 2)
+    return image
+
+# Create a star collectible when star.png is not available
+def draw_star_image():
+    image = pygame.Surface((32, 32), pygame.SRCALPHA)
+    # Star shape
+    points = [
+        (16, 0), (20, 12), (32, 12), (22, 20),
+        (26, 32), (16, 24), (6, 32), (10, 20),
+        (0, 12), (12, 12)
+    ]
+    pygame.draw.polygon(image, NEON_YELLOW, points, 0)
+    return image
+
+# The star image, loaded once and shared by every star
+def load_star_image():
+    return assets.image('star.png', draw_star_image)
 
 # World class to manage level
 class World():
-    def __init__(self):
+    def __init__(self, seed):
         self.platform_list = pygame.sprite.Group()
         self.star_list = pygame.sprite.Group()
         self.score = 0
         
+        # Stream the level in seeded chunks; entities keep fixed world coordinates
+        self.chunks = ChunkManager(seed, CHUNK_WIDTH, plan_chunk, self.spawn_chunk, self.despawn_chunk,
+                                   prepare_chunk=prepare_chunk, finish_chunk=finish_chunk)
+        
         # Parallax background layers
         self.bg_layers = []
+        self.far_layers = []
+        self.far_strip = None
+        self.far_strip_y = 0
+        self.far_strip_key = None
         self.create_background_layers()
         
+        # Star rotation frames shared by every star
+        self.star_frames = visual_effects.create_rotation_frames(load_star_image(), STAR_ROTATION_FRAMES)
+        
+        # Grid texture, blitted at a wrapped offset instead of drawing lines every frame
+        self.grid_texture = visual_effects.create_grid_texture(SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SIZE, GRID_COLOR, COLORKEY)
+        
     def create_background_layers(self):
         # Create multiple background layers for parallax effect
         # Layer 1: Distant city skyline
@@ -332,132 +406,222 @@ class World():
             color = (40, 40, 60)
             pygame.draw.rect(layer3, color, (x, y, width, height))
         
-        self.bg_layers = [
-            {"surface": layer1, "speed": 0.2},
-            {"surface": layer2, "speed": 0.5},
-            {"surface": layer3, "speed": 0.8}
+        layers = [
+            self.make_parallax_layer(layer1, 0.2),
+            self.make_parallax_layer(layer2, 0.5),
+            self.make_parallax_layer(layer3, 0.8)
         ]
-        
-    def draw(self, surface, camera_offset):
-        # Draw background layers with parallax effect
+        self.far_layers = [layer for layer in layers if layer["speed"] <= FAR_LAYER_SPEED]
+        self.bg_layers = [layer for layer in layers if layer["speed"] > FAR_LAYER_SPEED]
+        
+        # Far layers share one opaque, screen-wide strip covering all of them
+        if self.far_layers:
+            top = min(layer["y"] for layer in self.far_layers)
+            bottom = max(layer["y"] + layer["surface"].get_height() for layer in self.far_layers)
+            self.far_strip = pygame.Surface((SCREEN_WIDTH, bottom - top)).convert()
+            self.far_strip_y = top
+            self.far_strip_key = None
+        
+    def make_parallax_layer(self, layer_surface, speed):
+        """Trim a layer to its opaque rows and convert it to a colour-keyed display surface"""
+        # Keep the full width so the layer still tiles seamlessly
+        bounds = layer_surface.get_bounding_rect()
+        strip = pygame.Surface((layer_surface.get_width(), max(1, bounds.height)))
+        strip.fill(COLORKEY)
+        strip.blit(layer_surface, (0, -bounds.top))
+        strip.set_colorkey(COLORKEY, RLEACCEL)
+        return {"surface": strip.convert(), "speed": speed, "y": bounds.top}
+        
+    def draw_parallax_layer(self, surface, layer, camera_x, y):
+        """Draw a horizontally tiling parallax layer"""
+        width = layer["surface"].get_width()
+        x = -int(camera_x * layer["speed"]) % width
+        surface.blit(layer["surface"], (x - width, y))
+        surface.blit(layer["surface"], (x, y))
+        
+    def draw(self, surface, camera):
+        camera_offset = camera.offset
+        
+        # Draw the far layers from the cached strip, re-compositing only when they have scrolled
+        if self.far_strip is not None:
+            key = tuple(int(camera_offset[0] * layer["speed"]) for layer in self.far_layers)
+            if key != self.far_strip_key:
+                self.far_strip.fill(BLACK)
+                for layer in self.far_layers:
+                    self.draw_parallax_layer(self.far_strip, layer, camera_offset[0], layer["y"] - self.far_strip_y)
+                self.far_strip_key = key
+            surface.blit(self.far_strip, (0, self.far_strip_y))
+            
+        # Draw the remaining background layers with parallax effect
         for layer in self.bg_layers:
-            # Calculate parallax offset
-            offset_x = camera_offset[0] * layer["speed"]
-            # Draw the layer with offset
-            surface.blit(layer["surface"], (-offset_x % layer["surface"].get_width() - layer["surface"].get_width(), 0))
-            surface.blit(layer["surface"], (-offset_x % layer["surface"].get_width(), 0))
+            self.draw_parallax_layer(surface, layer, camera_offset[0], layer["y"])
         
         # Draw grid lines for cyberpunk effect
-        grid_offset_x = camera_offset[0] * 0.9
-        grid_offset_y = camera_offset[1] * 0.9
+        grid_offset_x = int(camera_offset[0] * 0.9) % GRID_SIZE
+        grid_offset_y = int(camera_offset[1] * 0.9) % GRID_SIZE
+        surface.blit(self.grid_texture, (-grid_offset_x, -grid_offset_y))
         
-        for x in range(0, SCREEN_WIDTH * 2, 50):
-            x_pos = x - (grid_offset_x % 50)
-            pygame.draw.line(surface, (20, 20, 40), (x_pos, 0), (x_pos, SCREEN_HEIGHT), 1)
-            
-        for y in range(0, SCREEN_HEIGHT * 2, 50):
-            y_pos = y - (grid_offset_y % 50)
-            pygame.draw.line(surface, (20, 20, 40), (0, y_pos), (SCREEN_WIDTH, y_pos), 1)
-        
-        # Draw platforms and stars with camera offset
+        # Draw visible platforms and stars with camera offset
         for platform in self.platform_list:
+            if not camera.is_visible(platform.rect):
+                continue
             surface.blit(platform.image, (platform.rect.x - camera_offset[0], platform.rect.y - camera_offset[1]))
             
         for star in self.star_list:
-            # Apply rotation to star
-            rotated_image = pygame.transform.rotate(star.image, star.angle)
-            # Get the rect of the rotated image and set its center to the star's center
-            rotated_rect = rotated_image.get_rect(center=star.rect.center)
-            surface.blit(rotated_image, (rotated_rect.x - camera_offset[0], rotated_rect.y - camera_offset[1]))
-        
-    def update(self, scroll, camera_offset):
-        # Update platform positions
-        for platform in self.platform_list:
-            platform.rect.x -= scroll
-            # Remove platforms that have gone off screen
-            if platform.rect.right < -100:
-                # Remove associated light sources
-                for i in range(len(visual_effects.light_sources) - 1, -1, -1):
-                    light = visual_effects.light_sources[i]
-                    if abs(light['x'] - platform.rect.centerx) < platform.width and abs(light['y'] - platform.rect.centery) < platform.height:
-                        visual_effects.light_sources.pop(i)
-                platform.kill()
-                
-        # Update star positions and animations
+            # Leave room for the rotated image's larger bounds
+            if not camera.is_visible(star.rect, 8):
+                continue
+            # Look up the pre-rendered rotation and centre it on the star
+            image, offset_x, offset_y = self.star_frames[star.angle * STAR_ROTATION_FRAMES // 360]
+            surface.blit(image, (star.rect.centerx + offset_x - camera_offset[0],
+                                 star.rect.centery + offset_y - camera_offset[1]))
+        
+    def update(self, camera):
+        # Animate stars
         for star in self.star_list:
-            star.rect.x -= scroll
             star.update()
-            # Remove stars that have gone off screen
-            if star.rect.right < -100:
-                # Remove associated light sources
-                for i in range(len(visual_effects.light_sources) - 1, -1, -1):
-                    light = visual_effects.light_sources[i]
-                    if light['color'] == NEON_YELLOW and abs(light['x'] - star.rect.centerx) < 30:
-                        visual_effects.light_sources.pop(i)
-                star.kill()
-
-# Function to generate platforms
-def generate_platforms(world, start_x, width=100):
-    # Create a platform at the given x position
-    y = random.randint(SCREEN_HEIGHT // 2, SCREEN_HEIGHT - 100)
-    platform_type = random.randint(1, 3)
-    platform = Platform(start_x, y, width, 20, platform_type)
-    world.platform_list.add(platform)
-    
-    # Randomly add a star above the platform
-    if random.random() < 0.7:  # 70% chance to spawn a star
-        star = Star(start_x + width // 2, y - 50)
-        world.star_list.add(star)
-    
-    return platform
+            
+        # Only the camera moves; stream chunks in and out around its view
+        view = camera.visible_world_rect
+        self.chunks.update(view.left, view.right)
+        
+    def spawn_chunk(self, chunk):
+        """Create the platforms, stars and lights planned for a chunk"""
+        rng = self.chunks.chunk_rng(chunk.index)
+        for spec in chunk.plan['platforms']:
+            platform = Platform(spec['x'], spec['y'], spec['width'], 20,
+                                spec['type'], spec['light'], spec.get('image'), spec['pattern'])
+            chunk.platforms.append(platform)
+            self.platform_list.add(platform)
+            if platform.light is not None:
+                chunk.lights.append(platform.light)
+                
+        for spec in chunk.plan['stars']:
+            if self.chunks.is_collected(chunk.index, spec['key']):
+                continue
+            star = Star(spec['x'], spec['y'], rng, spec.get('image'))
+            star.chunk = chunk
+            star.key = spec['key']
+            chunk.stars.append(star)
+            self.star_list.add(star)
+            
+    def despawn_chunk(self, chunk):
+        """Remove a chunk's platforms, stars and lights"""
+        for platform in chunk.platforms:
+            platform.kill()
+        for star in chunk.stars:
+            star.kill()
+            visual_effects.remove_light_source(star.light)
+        for light in chunk.lights:
+            visual_effects.remove_light_source(light)
+            
+    def collect_star(self, star):
+        """Remove a collected star and keep it from respawning with its chunk"""
+        star.kill()
+        visual_effects.remove_light_source(star.light)
+        if star.chunk is not None:
+            star.chunk.stars.remove(star)
+            self.chunks.mark_collected(star.chunk.index, star.key)
+
+# Plan one world chunk as plain data, drawing only from the chunk's own generator
+def plan_chunk(index, rng):
+    platforms = []
+    stars = []
+    left = index * CHUNK_WIDTH
+    for slot_left in range(left, left + CHUNK_WIDTH, PLATFORM_SLOT):
+        if slot_left == 0:
+            # First platform is longer for starting area
+            x = 0
+            width = START_PLATFORM_WIDTH
+        else:
+            # Keep at least 50 px to the next slot so gaps stay between 50 and 190 px
+            width = rng.randint(80 // PLATFORM_WIDTH_STEP, 150 // PLATFORM_WIDTH_STEP) * PLATFORM_WIDTH_STEP
+            x = slot_left + rng.randint(0, PLATFORM_SLOT - width - 50)
+        y = rng.randint(SCREEN_HEIGHT // 2, SCREEN_HEIGHT - 100)
+        platforms.append({
+            'x': x,
+            'y': y,
+            'width': width,
+            'type': rng.randint(1, 3),
+            'light': rng.random() < 0.3,
+            'pattern': rng.randrange(PATTERN_VARIANTS)
+        })
+        
+        # Randomly add a star above the platform
+        if rng.random() < 0.7:  # 70% chance to spawn a star
+            stars.append({'x': x + width // 2, 'y': y - 50, 'key': len(platforms) - 1})
+            
+    return {'platforms': platforms, 'stars': stars}
+
+# Render a planned chunk's surfaces; runs on the chunk generator thread,
+# so the cache leaves them unconverted until finish_chunk
+def prepare_chunk(index, plan):
+    for spec in plan['platforms']:
+        render_platform(spec['width'], 20, spec['type'], spec['pattern'])
+
+# Hand a chunk its display-format surfaces; runs on the main thread
+def finish_chunk(index, plan):
+    visual_effects.platform_cache.convert_pending()
+    for spec in plan['platforms']:
+        spec['image'] = render_platform(spec['width'], 20, spec['type'], spec['pattern'])
+    for spec in plan['stars']:
+        spec['image'] = load_star_image()
 
 # Main game function
 def main():
-    # Create placeholder sounds if needed
-    sound_files = sound_manager.create_placeholder_sounds()
-    
-    # Load sounds
-    sound_manager.load_sound('jump', os.path.join('assets', 'sounds', 'jump.wav'))
-    sound_manager.load_sound('collect', os.path.join('assets', 'sounds', 'collect.wav'))
-    sound_manager.load_sound('land', os.path.join('assets', 'sounds', 'land.wav'))
+    # Create placeholder sounds if needed and load them in the background;
+    # sounds that are still loading are skipped when played
+    sound_manager.preload_placeholder_sounds()
     
     # Create player
-    player = Player(100, SCREEN_HEIGHT - 150)
+    with startup_trace.span('Player()'):
+        player = Player(100, SCREEN_HEIGHT - 150)
     player_group = pygame.sprite.Group()
     player_group.add(player)
     
     # Create world
-    world = World()
-    
-    # Create initial platforms
-    for i in range(10):
-        if i == 0:
-            # First platform is longer for starting area
-            platform = generate_platforms(world, i * 200, 200)
-        else:
-            platform = generate_platforms(world, i * 200)
+    seed = WORLD_SEED if WORLD_SEED is not None else random.randrange(2 ** 32)
+    print(f"World seed: {seed}")
+    with startup_trace.span('World()'):
+        world = World(seed)
+    with startup_trace.span('first chunks'):
+        world.chunks.update(0, SCREEN_WIDTH)
     
     # Game variables
-    scroll = 0
-    camera_offset = [0, 0]
+    camera.snap_to(player)
+    camera_offset = camera.offset
     game_over = False
     score = 0
-    font = pygame.font.SysFont('Arial', 30)
+    with startup_trace.span('SysFont'):
+        font = pygame.font.SysFont('Arial', 30)
+    
+    # HUD widgets, drawn from a cached overlay
+    hud = Hud()
+    score_display = hud.add(GlowText(font, (20, 20), NEON_YELLOW, 'Stars: {}', score))
+    
+    if ADAPTIVE_QUALITY:
+        quality_governor.apply(visual_effects)
     
     # Main game loop
     running = True
+    exit_status = 0
     while running:
         clock.tick(FPS)
         
+        # Adapt effect quality to the time the last frame actually took
+        if ADAPTIVE_QUALITY and quality_governor.record_frame(clock.get_rawtime()):
+            quality_governor.apply(visual_effects)
+            stats = quality_governor.stats()
+            print(f"Quality tier: {stats['tier']} (avg frame {stats['average_ms']:.1f} ms, budget {stats['budget_ms']:.1f} ms)")
+        
         # Clear screen
         screen.fill(BLACK)
         
-        # Update camera to follow player
+        # Update camera to follow player (camera_offset is updated in place)
         camera.update(player)
-        camera_offset = [-camera.camera.x, -camera.camera.y]
         
         # Draw world with camera offset
-        world.draw(screen, camera_offset)
+        world.draw(screen, camera)
         
         # Update visual effects
         visual_effects.update_particles()
@@ -469,65 +633,30 @@ def main():
         screen.blit(player.image, (player.rect.x - camera_offset[0], player.rect.y - camera_offset[1]))
         
         # Draw particles
-        visual_effects.draw_particles(screen, camera_offset)
+        visual_effects.draw_particles(screen, camera_offset, camera.visible_world_rect)
         
         # Apply lighting effects
-        visual_effects.apply_lighting(screen)
+        visual_effects.apply_lighting(screen, camera_offset, camera.visible_world_rect)
         
         # Update player
         dx = player.update(world.platform_list)
         
         # Check if player has collected any stars
-        hits = pygame.sprite.spritecollide(player, world.star_list, True)
+        hits = pygame.sprite.spritecollide(player, world.star_list, False)
         for hit in hits:
+            world.collect_star(hit)
             score += 1
-            # Play collect sound
-            sound_manager.play_sound('collect', 0.5)
-            
-            # Add collection particles
-            for _ in range(15):
-                visual_effects.add_particle(
-                    hit.rect.centerx, hit.rect.centery,
-                    NEON_YELLOW, random.randint(2, 5),
-                    random.uniform(1, 3), random.randint(20, 40)
-                )
-                
-            # Remove the star's light source
-            for i in range(len(visual_effects.light_sources) - 1, -1, -1):
-                light = visual_effects.light_sources[i]
-                if light['color'] == NEON_YELLOW and abs(light['x'] - hit.rect.centerx) < 30:
-                    visual_effects.light_sources.pop(i)
-        
-        # Display score with glow effect
-        score_text = font.render(f'Stars: {score}', True, NEON_YELLOW)
-        # Add glow
-        glow_surface = pygame.Surface((score_text.get_width() + 10, score_text.get_height() + 10), pygame.SRCALPHA)
-        glow_rect = glow_surface.get_rect()
-        for i in range(5, 0, -1):
-            alpha = 50 - i * 10
-            pygame.draw.rect(glow_surface, (*NEON_YELLOW, alpha), 
-                            glow_rect.inflate(-i*2, -i*2), border_radius=3)
-        screen.blit(glow_surface, (15, 15))
-        screen.blit(score_text, (20, 20))
-        
-        # Update world with scroll
-        if player.rect.right > SCREEN_WIDTH - SCROLL_THRESHOLD:
-            scroll = player.rect.right - (SCREEN_WIDTH - SCROLL_THRESHOLD)
-        else:
-            scroll = 0
-            
-        world.update(scroll, camera_offset)
-        
-        # Generate new platforms as player moves right
-        if len(world.platform_list) < 10:
-            if world.platform_list:
-                last_platform = max([p.rect.right for p in world.platform_list])
-                gap = random.randint(50, 200)
-                width = random.randint(80, 150)
-                generate_platforms(world, last_platform + gap, width)
-            else:
-                # If no platforms exist, create one at a default position
-                generate_platforms(world, SCREEN_WIDTH // 2, 200)
+            game_events.emit(PICKUP, hit.rect.centerx, hit.rect.centery, 1)
+        
+        # Sound, particles and telemetry react to what happened this step
+        game_events.dispatch()
+        
+        # Display score with glow effect (re-rendered only when the score changes)
+        score_display.set_value(score)
+        hud.draw(screen)
+        
+        # Update world around the camera view
+        world.update(camera)
         
         # Event handling
         for event in pygame.event.get():
@@ -538,9 +667,25 @@ def main():
                     running = False
         
         pygame.display.update()
+        
+        # Cold start ends when the first frame is on screen (no-op afterwards);
+        # in budget check mode, shut down after it with the check's status
+        status = startup_trace.finish()
+        if status is not None:
+            exit_status = status
+            running = False
     
+    world.chunks.stop()
+    sound_manager.shutdown()
+    stats = visual_effects.platform_cache.stats()
+    print(f"Platform surface cache: {stats['entries']} surfaces, {stats['bytes'] // 1024} KiB, "
+          f"hit rate {stats['hit_rate']:.0%}")
+    stats = assets.stats()
+    print(f"Assets: {stats['loads']} images loaded in {stats['load_ms']:.1f} ms, "
+          f"{stats['hits']} shared, {stats['missing']} missing")
+    print(f"Events: {event_counts.summary()}")
     pygame.quit()
-    sys.exit()
+    sys.exit(exit_status)
 
 if __name__ == "__main__":
     main()
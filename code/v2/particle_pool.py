@@ -0,0 +1,169 @@
+from collections import deque
+
+# Eviction policies used when the pool is full
+EVICT_OLDEST = 'oldest'
+EVICT_LOWEST_PRIORITY = 'priority'
+
+class Particle:
+    """A pooled particle; instances are recycled rather than reallocated"""
+    __slots__ = ('x', 'y', 'dx', 'dy', 'size', 'color', 'lifetime', 'max_lifetime',
+                 'emitter', 'serial', 'index')
+
+    def __init__(self):
+        self.serial = -1
+        self.index = -1
+
+class Emitter:
+    """Budget and bookkeeping for one named particle source"""
+    def __init__(self, name, budget, priority=0):
+        self.name = name
+        self.budget = budget
+        self.priority = priority
+        self.live = 0
+        # Live particles in spawn order as (serial, particle); entries whose
+        # serial no longer matches the particle are stale and skipped lazily
+        self.spawn_order = deque()
+
+    def oldest(self):
+        """Return (serial, particle) for the oldest live particle, or None"""
+        spawn_order = self.spawn_order
+        while spawn_order:
+            serial, particle = spawn_order[0]
+            if particle.serial == serial:
+                return spawn_order[0]
+            spawn_order.popleft()
+        return None
+
+class ParticlePool:
+    def __init__(self, capacity=512, eviction=EVICT_OLDEST):
+        if eviction not in (EVICT_OLDEST, EVICT_LOWEST_PRIORITY):
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.capacity = capacity
+        self.eviction = eviction
+        self.emitters = {}
+        self.live = []
+        self.free = [Particle() for _ in range(capacity)]
+        self.next_serial = 0
+        self.evicted = 0
+        self.dropped = 0
+
+    def add_emitter(self, name, budget, priority=0):
+        """Register a named emitter with its own particle budget"""
+        emitter = Emitter(name, min(budget, self.capacity), priority)
+        self.emitters[name] = emitter
+        return emitter
+
+    def spawn(self, emitter_name, x, y, dx, dy, size, color, lifetime):
+        """Spawn a particle for an emitter; returns False if it was dropped"""
+        emitter = self.emitters[emitter_name]
+        if emitter.budget <= 0:
+            self.dropped += 1
+            return False
+
+        # An emitter at its budget recycles its own oldest particle
+        if emitter.live >= emitter.budget:
+            self._evict(emitter)
+        elif not self.free:
+            victim = self._choose_victim(emitter)
+            if victim is None:
+                self.dropped += 1
+                return False
+            self._evict(victim)
+
+        particle = self.free.pop()
+        particle.x = x
+        particle.y = y
+        particle.dx = dx
+        particle.dy = dy
+        particle.size = size
+        particle.color = color
+        particle.lifetime = lifetime
+        particle.max_lifetime = lifetime
+        particle.emitter = emitter
+        particle.serial = self.next_serial
+        particle.index = len(self.live)
+        self.next_serial += 1
+        self.live.append(particle)
+
+        emitter.live += 1
+        emitter.spawn_order.append((particle.serial, particle))
+        # Keep stale bookkeeping bounded when particles die out of spawn order
+        if len(emitter.spawn_order) > 2 * emitter.live + 32:
+            emitter.spawn_order = deque(entry for entry in emitter.spawn_order if entry[1].serial == entry[0])
+        return True
+
+    def update(self):
+        """Advance all live particles and release the expired ones"""
+        live = self.live
+        for i in range(len(live) - 1, -1, -1):
+            p = live[i]
+            p.x += p.dx
+            p.y += p.dy
+            p.lifetime -= 1
+
+            # Remove dead particles
+            if p.lifetime <= 0:
+                self._release(p)
+
+    def live_count(self, emitter_name):
+        """Number of live particles spawned by an emitter"""
+        return self.emitters[emitter_name].live
+
+    def live_counts(self):
+        """Live particle counts for every emitter"""
+        return {name: emitter.live for name, emitter in self.emitters.items()}
+
+    def clear(self):
+        """Release every live particle"""
+        for p in reversed(self.live):
+            self._release(p)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __len__(self):
+        return len(self.live)
+
+    def _choose_victim(self, incoming):
+        """Pick the emitter whose particle is evicted to make room, or None to drop"""
+        victim = None
+        victim_serial = None
+        for emitter in self.emitters.values():
+            if emitter.live == 0:
+                continue
+            serial = emitter.oldest()[0]
+            if self.eviction == EVICT_OLDEST:
+                better = victim is None or serial < victim_serial
+            else:
+                better = (victim is None or emitter.priority < victim.priority
+                          or (emitter.priority == victim.priority and serial < victim_serial))
+            if better:
+                victim = emitter
+                victim_serial = serial
+
+        # Never displace a more important effect with a less important one
+        if (victim is not None and self.eviction == EVICT_LOWEST_PRIORITY
+                and victim.priority > incoming.priority):
+            return None
+        return victim
+
+    def _evict(self, emitter):
+        """Release the oldest live particle of an emitter"""
+        entry = emitter.oldest()
+        if entry is None:
+            return
+        emitter.spawn_order.popleft()
+        self._release(entry[1])
+        self.evicted += 1
+
+    def _release(self, particle):
+        """Return a particle to the free list with an O(1) swap-remove"""
+        live = self.live
+        last = live.pop()
+        if last is not particle:
+            live[particle.index] = last
+            last.index = particle.index
+        particle.emitter.live -= 1
+        particle.serial = -1
+        particle.index = -1
+        self.free.append(particle)
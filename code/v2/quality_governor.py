@@ -0,0 +1,100 @@
+from collections import deque
+
+# Quality tiers from most to least expensive
+QUALITY_TIERS = [
+    {'name': 'high', 'particle_scale': 1.0, 'max_lights': None, 'shadow_detail': 2, 'lightmap_scale': 1},
+    {'name': 'medium', 'particle_scale': 0.6, 'max_lights': 16, 'shadow_detail': 1, 'lightmap_scale': 1},
+    {'name': 'low', 'particle_scale': 0.3, 'max_lights': 8, 'shadow_detail': 1, 'lightmap_scale': 2},
+    {'name': 'minimal', 'particle_scale': 0.1, 'max_lights': 4, 'shadow_detail': 0, 'lightmap_scale': 4}
+]
+
+class QualityGovernor:
+    def __init__(self, fps, tiers=QUALITY_TIERS, window=60, downgrade_ratio=0.9, upgrade_ratio=0.5,
+                 downgrade_cooldown=60, upgrade_cooldown=300):
+        self.tiers = tiers
+        self.tier_index = 0
+        self.budget_ms = 1000.0 / fps
+
+        # Rolling window of measured frame times
+        self.window = window
+        self.frame_times = deque(maxlen=window)
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+        self.frames = 0
+
+        # Hysteresis: step down when frames eat most of the budget, only step back up
+        # with plenty of headroom, and hold every tier for a minimum number of frames
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.downgrade_cooldown = downgrade_cooldown
+        self.upgrade_cooldown = upgrade_cooldown
+        self.frames_in_tier = 0
+        self.tier_changes = 0
+
+    @property
+    def tier(self):
+        """The settings of the current quality tier"""
+        return self.tiers[self.tier_index]
+
+    @property
+    def average_ms(self):
+        """Average frame time over the rolling window"""
+        if not self.frame_times:
+            return 0.0
+        return self.total_ms / len(self.frame_times)
+
+    def record_frame(self, frame_ms):
+        """Record the work time of one frame; returns True if the quality tier changed"""
+        if len(self.frame_times) == self.window:
+            self.total_ms -= self.frame_times[0]
+        self.frame_times.append(frame_ms)
+        self.total_ms += frame_ms
+        self.worst_ms = max(self.worst_ms, frame_ms)
+        self.frames += 1
+        self.frames_in_tier += 1
+
+        # Wait for a full window of measurements at the current tier
+        if len(self.frame_times) < self.window:
+            return False
+
+        average = self.average_ms
+        if (average > self.budget_ms * self.downgrade_ratio
+                and self.frames_in_tier >= self.downgrade_cooldown
+                and self.tier_index < len(self.tiers) - 1):
+            self.set_tier(self.tier_index + 1)
+            return True
+        if (average < self.budget_ms * self.upgrade_ratio
+                and self.frames_in_tier >= self.upgrade_cooldown
+                and self.tier_index > 0):
+            self.set_tier(self.tier_index - 1)
+            return True
+        return False
+
+    def set_tier(self, index):
+        """Switch to a quality tier and start measuring it from scratch"""
+        self.tier_index = max(0, min(index, len(self.tiers) - 1))
+        self.frame_times.clear()
+        self.total_ms = 0.0
+        self.worst_ms = 0.0
+        self.frames_in_tier = 0
+        self.tier_changes += 1
+
+    def apply(self, visual_effects):
+        """Push the current tier's settings into the visual effects system"""
+        tier = self.tier
+        visual_effects.particle_scale = tier['particle_scale']
+        visual_effects.max_lights = tier['max_lights']
+        visual_effects.shadow_detail = tier['shadow_detail']
+        visual_effects.set_lightmap_scale(tier['lightmap_scale'])
+
+    def stats(self):
+        """Current tier and frame-time statistics, suitable for logging"""
+        return {
+            'tier': self.tier['name'],
+            'tier_index': self.tier_index,
+            'average_ms': self.average_ms,
+            'worst_ms': self.worst_ms,
+            'budget_ms': self.budget_ms,
+            'frames': self.frames,
+            'tier_changes': self.tier_changes
+        }
@@ -1,11 +1,165 @@
 import pygame
 import os
+import startup_trace
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Placeholder sound effects as file name: (frequency in Hz, duration in ms)
+PLACEHOLDER_SOUNDS = {
+    "jump.wav": (440, 300),  # A4 note
+    "collect.wav": (880, 200),  # A5 note
+    "land.wav": (220, 150)  # A3 note
+}
+PLACEHOLDER_SAMPLE_RATE = 44100
+PLACEHOLDER_AMPLITUDE = 32767 / 4  # 1/4 of max amplitude
+# Bump when the beep generator changes so existing files are regenerated
+PLACEHOLDER_VERSION = 1
+PLACEHOLDER_MANIFEST = ".placeholders.json"
+
+# Mixer channels reserved for each voice group
+VOICE_GROUPS = {
+    "player": 3,
+    "pickups": 3,
+    "effects": 2
+}
+
+class Voice:
+    """What is playing on one reserved channel"""
+    def __init__(self, channel):
+        self.channel = channel
+        self.name = None
+        self.sound = None
+        self.priority = 0
+        self.started = 0
+        
+    def is_active(self):
+        """Whether the channel is still playing the sound this voice started"""
+        return self.sound is not None and self.channel.get_sound() is self.sound
+
+class VoiceManager:
+    def __init__(self, groups=VOICE_GROUPS):
+        """Plays sounds on reserved channel groups with per-sound limits and voice stealing"""
+        total = sum(groups.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        # Keep un-grouped Sound.play() calls off the reserved channels
+        pygame.mixer.set_reserved(total)
+        
+        self.groups = {}
+        first = 0
+        for group, count in groups.items():
+            self.groups[group] = [Voice(pygame.mixer.Channel(i)) for i in range(first, first + count)]
+            first += count
+            
+        # Per-sound settings and the time each sound last started
+        self.settings = {}
+        self.last_played = {}
+        self.played = 0
+        self.stolen = 0
+        self.limited = 0
+        self.dropped = 0
+        
+    def configure(self, name, group, priority=0, max_voices=1, cooldown_ms=0):
+        """Set the group, priority, concurrency limit and cooldown for a sound"""
+        if group not in self.groups:
+            raise ValueError(f"Unknown voice group: {group}")
+        self.settings[name] = {
+            'group': group,
+            'priority': priority,
+            'max_voices': max_voices,
+            'cooldown_ms': cooldown_ms
+        }
+        
+    def play(self, name, sound, volume=0.5, loops=0):
+        """Play a sound on its group's channels; returns the channel, or None if skipped"""
+        settings = self.settings.get(name)
+        if settings is None:
+            settings = {'group': 'effects', 'priority': 0, 'max_voices': 1, 'cooldown_ms': 0}
+        now = pygame.time.get_ticks()
+        
+        # Rate limit repeats of the same sound
+        last = self.last_played.get(name)
+        if last is not None and now - last < settings['cooldown_ms']:
+            self.limited += 1
+            return None
+            
+        voices = self.groups[settings['group']]
+        voice = self._choose_voice(voices, name, settings)
+        if voice is None:
+            self.dropped += 1
+            return None
+            
+        voice.channel.play(sound, loops)
+        # Per-play volume lives on the channel so other instances are unaffected
+        voice.channel.set_volume(volume)
+        voice.name = name
+        voice.sound = sound
+        voice.priority = settings['priority']
+        voice.started = now
+        self.last_played[name] = now
+        self.played += 1
+        return voice.channel
+        
+    def stop_all(self):
+        """Stop every reserved channel"""
+        for voices in self.groups.values():
+            for voice in voices:
+                voice.channel.stop()
+                voice.sound = None
+                
+    def active_voices(self):
+        """Number of sounds playing in each group"""
+        return {group: sum(voice.is_active() for voice in voices) for group, voices in self.groups.items()}
+        
+    def stats(self):
+        """Play, steal and drop counts, suitable for logging"""
+        return {
+            'played': self.played,
+            'stolen': self.stolen,
+            'limited': self.limited,
+            'dropped': self.dropped
+        }
+        
+    def _choose_voice(self, voices, name, settings):
+        """Pick the voice to play on: a free one, or the best one to steal"""
+        free = None
+        same = []
+        for voice in voices:
+            if voice.is_active():
+                if voice.name == name:
+                    same.append(voice)
+            elif free is None:
+                free = voice
+                
+        # At the sound's own limit, restart its oldest instance
+        if len(same) >= settings['max_voices']:
+            self.stolen += 1
+            return min(same, key=lambda voice: voice.started)
+        if free is not None:
+            return free
+            
+        # Group is full: steal the lowest-priority, oldest voice that is not more important
+        victim = min(voices, key=lambda voice: (voice.priority, voice.started))
+        if victim.priority > settings['priority']:
+            return None
+        self.stolen += 1
+        return victim
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, sounds_dir="assets/sounds", workers=2, voice_groups=VOICE_GROUPS):
         pygame.mixer.init()
         self.sounds = {}
         self.music_playing = False
+        self.sounds_dir = sounds_dir
+        self.voices = VoiceManager(voice_groups)
+        
+        # Background generation and decoding; sounds still loading are kept as futures
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sound-loader')
+        self.pending = {}
+        self.manifest_lock = threading.Lock()
+        self.manifest = None
         
     def load_sound(self, name, file_path):
         """Load a sound effect and store it in the sounds dictionary"""
@@ -17,11 +171,45 @@ class SoundManager:
             print(f"Error loading sound: {file_path}")
             return False
             
+    def load_sound_async(self, name, file_path, placeholder=None):
+        """Load a sound effect on the loader pool; play_sound ignores it until it is ready
+        
+        placeholder, a (frequency, duration_ms) pair, generates the file first
+        if it is missing or was generated with different parameters.
+        """
+        self.pending[name] = self.executor.submit(self._load_task, file_path, placeholder)
+        
+    def preload_placeholder_sounds(self):
+        """Generate (if needed) and load every placeholder sound in the background"""
+        for filename, params in PLACEHOLDER_SOUNDS.items():
+            name = os.path.splitext(filename)[0]
+            self.load_sound_async(name, os.path.join(self.sounds_dir, filename), params)
+            
+    def wait_until_loaded(self, timeout=None):
+        """Block until every pending sound has loaded; returns False on timeout"""
+        for future in list(self.pending.values()):
+            try:
+                future.result(timeout)
+            except Exception:
+                return False
+        self._collect_loaded()
+        return True
+        
+    def shutdown(self):
+        """Stop the loader pool, dropping sounds that have not started loading"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        
     def play_sound(self, name, volume=0.5, loops=0):
         """Play a sound effect by name"""
+        if name not in self.sounds and name in self.pending:
+            self._collect_loaded()
         if name in self.sounds:
-            self.sounds[name].set_volume(volume)
-            self.sounds[name].play(loops)
+            return self.voices.play(name, self.sounds[name], volume, loops)
+        return None
+        
+    def configure_sound(self, name, group, priority=0, max_voices=1, cooldown_ms=0):
+        """Set how a sound effect shares the mixer; see VoiceManager.configure"""
+        self.voices.configure(name, group, priority, max_voices, cooldown_ms)
             
     def play_music(self, file_path, volume=0.3, loops=-1):
         """Play background music"""
@@ -39,24 +227,75 @@ class SoundManager:
         self.music_playing = False
         
     def create_placeholder_sounds(self):
-        """Create placeholder sound files for testing"""
-        sounds_dir = "assets/sounds"
-        os.makedirs(sounds_dir, exist_ok=True)
+        """Create placeholder sound files for testing, skipping ones that are up to date"""
+        files = []
+        for filename, (frequency, duration_ms) in PLACEHOLDER_SOUNDS.items():
+            file_path = os.path.join(self.sounds_dir, filename)
+            self._ensure_placeholder(file_path, frequency, duration_ms)
+            files.append(file_path)
+        return files
         
-        # Create simple sound files using pygame
-        self._create_beep_sound(os.path.join(sounds_dir, "jump.wav"), 440, 300)  # A4 note
-        self._create_beep_sound(os.path.join(sounds_dir, "collect.wav"), 880, 200)  # A5 note
-        self._create_beep_sound(os.path.join(sounds_dir, "land.wav"), 220, 150)  # A3 note
+    def _load_task(self, file_path, placeholder):
+        """Loader pool task: generate the placeholder if needed, then decode the sound"""
+        with startup_trace.span(file_path, 'asset'):
+            if placeholder is not None:
+                self._ensure_placeholder(file_path, *placeholder)
+            return pygame.mixer.Sound(file_path)
         
-        return [
-            os.path.join(sounds_dir, "jump.wav"),
-            os.path.join(sounds_dir, "collect.wav"),
-            os.path.join(sounds_dir, "land.wav")
-        ]
+    def _collect_loaded(self):
+        """Move finished loads into the sounds dictionary without blocking"""
+        for name, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[name]
+            try:
+                self.sounds[name] = future.result()
+            except Exception as e:
+                print(f"Error loading sound {name}: {e}")
+                
+    @staticmethod
+    def _placeholder_hash(frequency, duration_ms):
+        """Hash of everything that determines a placeholder file's contents"""
+        params = [PLACEHOLDER_VERSION, PLACEHOLDER_SAMPLE_RATE, PLACEHOLDER_AMPLITUDE, frequency, duration_ms]
+        return hashlib.sha1(json.dumps(params).encode()).hexdigest()
         
+    def _ensure_placeholder(self, file_path, frequency, duration_ms):
+        """Generate a placeholder unless the file exists and the manifest hash matches"""
+        directory, filename = os.path.split(file_path)
+        digest = self._placeholder_hash(frequency, duration_ms)
+        with self.manifest_lock:
+            if self.manifest is None:
+                self.manifest = self._read_manifest(directory)
+            if os.path.exists(file_path) and self.manifest.get(filename) == digest:
+                return True
+            
+        os.makedirs(directory, exist_ok=True)
+        if not self._create_beep_sound(file_path, frequency, duration_ms):
+            return False
+        with self.manifest_lock:
+            self.manifest[filename] = digest
+            self._write_manifest(directory)
+        return True
+        
+    def _read_manifest(self, directory):
+        """Read the placeholder manifest, treating a missing or broken one as empty"""
+        try:
+            with open(os.path.join(directory, PLACEHOLDER_MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+            
+    def _write_manifest(self, directory):
+        """Write the placeholder manifest; caller holds manifest_lock"""
+        try:
+            with open(os.path.join(directory, PLACEHOLDER_MANIFEST), 'w') as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print(f"Error writing sound manifest: {e}")
+            
     def _create_beep_sound(self, filename, frequency, duration_ms):
         """Create a simple beep sound file"""
-        sample_rate = 44100
+        sample_rate = PLACEHOLDER_SAMPLE_RATE
         bits = 16
         
         # Calculate samples
@@ -65,7 +304,7 @@ class SoundManager:
         
         # Generate a simple sine wave
         import math
-        amplitude = 32767 / 4  # 1/4 of max amplitude
+        amplitude = PLACEHOLDER_AMPLITUDE
         for i in range(num_samples):
             t = float(i) / sample_rate
             value = int(amplitude * math.sin(2.0 * math.pi * frequency * t))
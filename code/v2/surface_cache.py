@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+class SurfaceCache:
+    def __init__(self, max_entries=128):
+        """Least-recently-used cache of shared, display-format surfaces"""
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        # Keys of surfaces created off the main thread, not yet in display format
+        self.unconverted = set()
+
+    def get(self, key, factory):
+        """Return the surface for key, creating it with factory() on a miss
+
+        Surfaces are shared between every caller asking for the same key, so they
+        must not be drawn on afterwards. Surfaces created off the main thread are
+        left as they are until convert_pending() runs on the main thread.
+        """
+        with self.lock:
+            surface = self.entries.get(key)
+            if surface is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        # Render outside the lock; two threads racing on one key just both render it
+        surface = factory()
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        if on_main_thread and pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key]
+            self.entries[key] = surface
+            if not on_main_thread:
+                self.unconverted.add(key)
+            self.bytes += self.surface_bytes(surface)
+            while len(self.entries) > self.max_entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= self.surface_bytes(evicted)
+                self.evictions += 1
+        return surface
+
+    def convert_pending(self):
+        """Convert surfaces created off the main thread; call from the main thread"""
+        if not self.unconverted or pygame.display.get_surface() is None:
+            return
+        with self.lock:
+            keys = [key for key in self.unconverted if key in self.entries]
+            self.unconverted.clear()
+            for key in keys:
+                surface = self.entries[key].convert_alpha()
+                self.bytes += self.surface_bytes(surface) - self.surface_bytes(self.entries[key])
+                self.entries[key] = surface
+
+    def clear(self):
+        """Drop every cached surface"""
+        with self.lock:
+            self.entries.clear()
+            self.unconverted.clear()
+            self.bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Approximate pixel memory held by a surface"""
+        return surface.get_pitch() * surface.get_height()
+
+    def hit_rate(self):
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Hit rate and memory footprint, suitable for logging"""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+            'bytes': self.bytes
+        }
@@ -1,16 +1,79 @@
 import pygame
 import random
 import math
+from particle_pool import ParticlePool, EVICT_OLDEST
+from surface_cache import SurfaceCache
+
+# Supported lightmap resolutions (1 = full screen, 2 = half, 4 = quarter)
+LIGHTMAP_SCALES = (1, 2, 4)
 
 class VisualEffects:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, lightmap_scale=1, max_particles=512, eviction=EVICT_OLDEST):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.particles = []
+        
+        # Fixed-capacity particle pool; ad-hoc particles go to the 'default' emitter
+        self.particles = ParticlePool(max_particles, eviction)
+        self.particles.add_emitter('default', max_particles // 4, 1)
+        self.emitter_settings = {}
+        
+        # Platform surfaces shared by every platform of the same variant
+        self.platform_cache = SurfaceCache()
         self.shadows = []
-        self.light_sources = []
+        # Lights by id, so removing one is O(1); insertion order is drawing order
+        self.light_sources = {}
+        
+        # Quality settings (driven by the quality governor)
+        self.particle_scale = 1.0
+        self.max_lights = None
+        self.shadow_detail = 2
+        
+        # Lightmap buffers and cached light gradients
+        self.lightmap_scale = 1
+        self.lightmap = None
+        self.lightmap_upscaled = None
+        self.light_masks = {}
+        self.set_lightmap_scale(lightmap_scale)
+        
+    def scaled_count(self, count):
+        """Scale a particle emission count by the current quality setting"""
+        # Round stochastically so small bursts keep the right average at low quality
+        return int(count * self.particle_scale + random.random())
+        
+    def add_emitter(self, name, color, size=(2, 4), speed=(1, 3), lifetime=(20, 40), direction=None,
+                    budget=64, priority=1):
+        """Register a named particle emitter with its own budget and spawn ranges
+        
+        size and lifetime are (min, max) integer ranges, speed is a (min, max) float
+        range, and direction is either None for a random heading or ((dx_min, dx_max),
+        (dy_min, dy_max)) velocity ranges. Lower priority emitters are evicted first
+        when the pool uses the priority eviction policy.
+        """
+        self.particles.add_emitter(name, budget, priority)
+        self.emitter_settings[name] = {
+            'color': color,
+            'size': size,
+            'speed': speed,
+            'lifetime': lifetime,
+            'direction': direction
+        }
         
-    def add_particle(self, x, y, color, size=3, speed=2, lifetime=30, direction=None):
+    def emit(self, name, x, y, count=1):
+        """Emit a quality-scaled burst of particles from a named emitter"""
+        settings = self.emitter_settings[name]
+        size = settings['size']
+        speed = settings['speed']
+        lifetime = settings['lifetime']
+        direction = settings['direction']
+        for _ in range(self.scaled_count(count)):
+            if direction is None:
+                velocity = None
+            else:
+                velocity = (random.uniform(*direction[0]), random.uniform(*direction[1]))
+            self.add_particle(x, y, settings['color'], random.randint(*size), random.uniform(*speed),
+                              random.randint(*lifetime), velocity, name)
+            
+    def add_particle(self, x, y, color, size=3, speed=2, lifetime=30, direction=None, emitter='default'):
         """Add a particle effect at the given position"""
         if direction is None:
             angle = random.uniform(0, math.pi * 2)
@@ -19,26 +82,23 @@ class VisualEffects:
         else:
             dx, dy = direction
             
-        self.particles.append({
-            'x': x,
-            'y': y,
-            'dx': dx,
-            'dy': dy,
-            'size': size,
-            'color': color,
-            'lifetime': lifetime,
-            'max_lifetime': lifetime
-        })
+        return self.particles.spawn(emitter, x, y, dx, dy, size, color, lifetime)
         
     def add_light_source(self, x, y, radius, color, intensity=0.7):
-        """Add a light source at the given position"""
-        self.light_sources.append({
+        """Add a light source at the given position and return it"""
+        light = {
             'x': x,
             'y': y,
             'radius': radius,
             'color': color,
             'intensity': intensity
-        })
+        }
+        self.light_sources[id(light)] = light
+        return light
+        
+    def remove_light_source(self, light):
+        """Remove a light source returned by add_light_source, in O(1)"""
+        self.light_sources.pop(id(light), None)
         
     def add_shadow(self, entity, length=20, direction=(1, 1)):
         """Add a shadow for an entity"""
@@ -50,90 +110,162 @@ class VisualEffects:
         
     def update_particles(self):
         """Update all particles"""
-        for i in range(len(self.particles) - 1, -1, -1):
-            p = self.particles[i]
-            p['x'] += p['dx']
-            p['y'] += p['dy']
-            p['lifetime'] -= 1
-            
-            # Remove dead particles
-            if p['lifetime'] <= 0:
-                self.particles.pop(i)
+        self.particles.update()
                 
-    def draw_particles(self, surface, camera_offset=(0, 0)):
-        """Draw all particles"""
+    def draw_particles(self, surface, camera_offset=(0, 0), view=None):
+        """Draw all particles, skipping those outside the view rect (world coordinates) if given"""
         for p in self.particles:
+            if view is not None and not (view.left - p.size < p.x < view.right + p.size and
+                                         view.top - p.size < p.y < view.bottom + p.size):
+                continue
+                
             # Calculate fade based on lifetime
-            alpha = int(255 * (p['lifetime'] / p['max_lifetime']))
-            color = list(p['color'])
+            alpha = int(255 * (p.lifetime / p.max_lifetime))
+            color = list(p.color)
             if len(color) < 4:
                 color.append(alpha)
             else:
                 color[3] = alpha
                 
             # Draw particle with camera offset
-            x = int(p['x'] - camera_offset[0])
-            y = int(p['y'] - camera_offset[1])
+            x = int(p.x - camera_offset[0])
+            y = int(p.y - camera_offset[1])
             
             # Create a surface for the particle with transparency
-            particle_surface = pygame.Surface((p['size'] * 2, p['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, color, (p['size'], p['size']), p['size'])
-            surface.blit(particle_surface, (x - p['size'], y - p['size']))
+            particle_surface = pygame.Surface((p.size * 2, p.size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(particle_surface, color, (p.size, p.size), p.size)
+            surface.blit(particle_surface, (x - p.size, y - p.size))
             
     def draw_shadows(self, surface, camera_offset=(0, 0)):
         """Draw shadows for entities"""
-        for shadow in self.shadows:
-            entity = shadow['entity']
-            length = shadow['length']
-            direction = shadow['direction']
-            
-            # Create shadow polygon
-            shadow_points = []
-            rect = entity.rect
+        if self.shadow_detail == 0 or not self.shadows:
+            return
             
-            # Base points (entity corners)
-            shadow_points.append((rect.left, rect.top))
-            shadow_points.append((rect.right, rect.top))
-            shadow_points.append((rect.right, rect.bottom))
-            shadow_points.append((rect.left, rect.bottom))
-            
-            # Offset points (shadow corners)
-            shadow_points.append((rect.left + direction[0] * length, rect.bottom + direction[1] * length))
-            shadow_points.append((rect.right + direction[0] * length, rect.bottom + direction[1] * length))
+        # Reduced detail draws every shadow into one shared overlay
+        if self.shadow_detail == 1:
+            shadow_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
             
-            # Adjust for camera
-            adjusted_points = [(x - camera_offset[0], y - camera_offset[1]) for x, y in shadow_points]
+        for shadow in self.shadows:
+            adjusted_points = self.shadow_polygon(shadow, camera_offset)
             
             # Draw shadow
-            shadow_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-            pygame.draw.polygon(shadow_surface, (0, 0, 0, 100), adjusted_points)
+            if self.shadow_detail == 1:
+                pygame.draw.polygon(shadow_surface, (0, 0, 0, 100), adjusted_points)
+            else:
+                shadow_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+                pygame.draw.polygon(shadow_surface, (0, 0, 0, 100), adjusted_points)
+                surface.blit(shadow_surface, (0, 0))
+                
+        if self.shadow_detail == 1:
             surface.blit(shadow_surface, (0, 0))
             
-    def apply_lighting(self, surface):
-        """Apply lighting effects to the surface"""
-        # Create a dark overlay
-        dark_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        dark_surface.fill((0, 0, 0, 100))  # Semi-transparent black
-        
-        # Cut out light areas
-        for light in self.light_sources:
-            # Create a circular light mask
-            light_mask = pygame.Surface((light['radius'] * 2, light['radius'] * 2), pygame.SRCALPHA)
+    def shadow_polygon(self, shadow, camera_offset):
+        """Build the screen-space shadow polygon for a shadowed entity"""
+        entity = shadow['entity']
+        length = shadow['length']
+        direction = shadow['direction']
+        
+        # Create shadow polygon
+        shadow_points = []
+        rect = entity.rect
+        
+        # Base points (entity corners)
+        shadow_points.append((rect.left, rect.top))
+        shadow_points.append((rect.right, rect.top))
+        shadow_points.append((rect.right, rect.bottom))
+        shadow_points.append((rect.left, rect.bottom))
+        
+        # Offset points (shadow corners)
+        shadow_points.append((rect.left + direction[0] * length, rect.bottom + direction[1] * length))
+        shadow_points.append((rect.right + direction[0] * length, rect.bottom + direction[1] * length))
+        
+        # Adjust for camera
+        return [(x - camera_offset[0], y - camera_offset[1]) for x, y in shadow_points]
+        
+    def set_lightmap_scale(self, scale):
+        """Select the lightmap resolution as a divisor of the screen size (1, 2 or 4)"""
+        if scale not in LIGHTMAP_SCALES:
+            raise ValueError(f"Unsupported lightmap scale: {scale}")
+        if scale == self.lightmap_scale and self.lightmap is not None:
+            return
+        self.lightmap_scale = scale
+        self.lightmap = pygame.Surface((self.screen_width // scale, self.screen_height // scale), pygame.SRCALPHA)
+        if scale != 1:
+            self.lightmap_upscaled = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        else:
+            self.lightmap_upscaled = None
+        # Gradients are rendered at lightmap resolution, so the old ones no longer fit
+        self.light_masks = {}
+        
+    def get_light_mask(self, radius, color, intensity):
+        """Return a cached radial gradient for a light at the current lightmap scale"""
+        key = (radius, tuple(color), intensity)
+        mask = self.light_masks.get(key)
+        if mask is None:
+            scaled_radius = max(1, radius // self.lightmap_scale)
+            mask = pygame.Surface((scaled_radius * 2, scaled_radius * 2), pygame.SRCALPHA)
             
             # Create gradient light
-            for r in range(light['radius'], 0, -1):
-                alpha = int(255 * (1 - (r / light['radius'])) * light['intensity'])
-                color = (*light['color'], alpha)
-                pygame.draw.circle(light_mask, color, (light['radius'], light['radius']), r)
+            for r in range(scaled_radius, 0, -1):
+                alpha = int(255 * (1 - (r / scaled_radius)) * intensity)
+                pygame.draw.circle(mask, (*color, alpha), (scaled_radius, scaled_radius), r)
+            self.light_masks[key] = mask
+        return mask
+        
+    def apply_lighting(self, surface, camera_offset=(0, 0), view=None):
+        """Apply lighting effects to the surface, skipping lights outside the view rect if given"""
+        scale = self.lightmap_scale
+        
+        # Start from a dark overlay at lightmap resolution
+        lightmap = self.lightmap
+        lightmap.fill((0, 0, 0, 100))  # Semi-transparent black
+        
+        # Cut out light areas, up to the quality setting's light budget
+        drawn = 0
+        for light in self.light_sources.values():
+            if self.max_lights is not None and drawn >= self.max_lights:
+                break
+            radius = light['radius']
+            if view is not None and not (view.left - radius < light['x'] < view.right + radius and
+                                         view.top - radius < light['y'] < view.bottom + radius):
+                continue
                 
-            # Apply light to dark surface
-            dark_surface.blit(light_mask, (light['x'] - light['radius'], light['y'] - light['radius']), special_flags=pygame.BLEND_RGBA_SUB)
+            light_mask = self.get_light_mask(radius, light['color'], light['intensity'])
+            half = light_mask.get_width() // 2
+            x = int(light['x'] - camera_offset[0]) // scale - half
+            y = int(light['y'] - camera_offset[1]) // scale - half
+            lightmap.blit(light_mask, (x, y), special_flags=pygame.BLEND_RGBA_SUB)
+            drawn += 1
+            
+        # Upscale the lightmap; the falloff is smooth, so the filtering hides the lower resolution
+        if scale != 1:
+            lightmap = pygame.transform.smoothscale(lightmap, (self.screen_width, self.screen_height),
+                                                    self.lightmap_upscaled)
             
         # Apply the final lighting to the main surface
-        surface.blit(dark_surface, (0, 0))
+        surface.blit(lightmap, (0, 0))
+        
+    def create_rotation_frames(self, image, frame_count):
+        """Pre-render a full turn of rotations as (surface, x offset, y offset) from the image centre"""
+        frames = []
+        for i in range(frame_count):
+            rotated = pygame.transform.rotate(image, i * 360 / frame_count)
+            frames.append((rotated, -rotated.get_width() // 2, -rotated.get_height() // 2))
+        return frames
         
-    def create_3d_platform(self, width, height, color, highlight_color, shadow_color, depth=10):
-        """Create a 3D platform surface"""
+    def create_grid_texture(self, width, height, cell_size, color, colorkey=(255, 0, 255)):
+        """Render a grid one cell larger than the view so it can be blitted at any wrapped offset"""
+        surface = pygame.Surface((width + cell_size, height + cell_size))
+        surface.fill(colorkey)
+        for x in range(0, width + cell_size, cell_size):
+            pygame.draw.line(surface, color, (x, 0), (x, height + cell_size), 1)
+        for y in range(0, height + cell_size, cell_size):
+            pygame.draw.line(surface, color, (0, y), (width + cell_size, y), 1)
+        surface.set_colorkey(colorkey, pygame.RLEACCEL)
+        return surface.convert()
+        
+    def create_3d_platform(self, width, height, color, highlight_color, shadow_color, depth=10, pattern_seed=None):
+        """Create a 3D platform surface; a pattern_seed makes the circuit pattern repeatable"""
         # Create main surface with extra space for 3D effect
         surface = pygame.Surface((width, height + depth), pygame.SRCALPHA)
         
@@ -171,8 +303,15 @@ class VisualEffects:
         pygame.draw.line(surface, highlight_color, (0, 0), (width, 0), 2)
         
         # Add circuit-like patterns
+        rng = random if pattern_seed is None else random.Random(pattern_seed)
         for _ in range(3):
-            x1 = random.randint(5, width-5)
+            x1 = rng.randint(5, width-5)
             pygame.draw.line(surface, highlight_color, (x1, 0), (x1, height), 1)
             
         return surface
+        
+    def cached_3d_platform(self, key, width, height, color, highlight_color, shadow_color, depth=10, pattern_seed=None):
+        """Return a shared 3D platform surface, creating it on the first request for key"""
+        return self.platform_cache.get(key, lambda: self.create_3d_platform(
+            width, height, color, highlight_color, shadow_color, depth, pattern_seed
+        ))
@@ -0,0 +1,175 @@
+import queue
+import random
+import threading
+
+class Chunk:
+    """Everything spawned for one fixed-width slice of the world"""
+    def __init__(self, index, left, width, plan):
+        self.index = index
+        self.left = left
+        self.right = left + width
+        self.plan = plan
+
+        # Entities and lights owned by this chunk, so it can be unloaded in O(chunk)
+        self.platforms = []
+        self.stars = []
+        self.lights = []
+
+class ChunkManager:
+    def __init__(self, seed, chunk_width, plan_chunk, spawn_chunk, despawn_chunk, load_behind=1, load_ahead=2,
+                 prepare_chunk=None, finish_chunk=None, lookahead=2, threaded=True):
+        """Stream world chunks in and out around the view
+
+        plan_chunk(index, rng) returns a plain-data description of a chunk and must
+        only draw from the rng it is given, so the same seed and index always plan the
+        same chunk. prepare_chunk(index, plan), if given, does the expensive part of
+        building a chunk (such as rendering surfaces) and stores it in the plan.
+        Both run on a background thread for the next `lookahead` chunks, so they
+        must not touch sprite groups or other main-thread state, nor convert surfaces.
+        finish_chunk(index, plan), if given, runs on the main thread once a plan is
+        handed over, and is where its surfaces are converted for the display.
+        An exception in the background is printed and the chunk is generated again
+        on the main thread when it is needed.
+
+        spawn_chunk(chunk) creates the chunk's entities from chunk.plan and
+        despawn_chunk(chunk) removes them again; both run on the main thread.
+        """
+        self.seed = seed
+        self.chunk_width = chunk_width
+        self.plan_chunk = plan_chunk
+        self.prepare_chunk = prepare_chunk
+        self.finish_chunk = finish_chunk
+        self.spawn_chunk = spawn_chunk
+        self.despawn_chunk = despawn_chunk
+        self.load_behind = load_behind
+        self.load_ahead = load_ahead
+        self.lookahead = lookahead
+        self.chunks = {}
+
+        # Stars collected in chunks that may be streamed in again, as (chunk index, star key)
+        self.collected = set()
+
+        # Lookahead generation: indices go to the worker, finished plans come back
+        self.requested = set()
+        self.ready = {}
+        self.window_first = 0
+        self.sync_loads = 0
+        self.worker = None
+        if threaded:
+            self.requests = queue.Queue()
+            self.completed = queue.Queue()
+            self.worker = threading.Thread(target=self._work, name='chunk-generator', daemon=True)
+            self.worker.start()
+
+    def chunk_rng(self, index):
+        """Random generator for a chunk, derived only from the world seed and chunk index"""
+        return random.Random(f"{self.seed}:{index}")
+
+    def chunk_index(self, x):
+        """Index of the chunk containing world x coordinate"""
+        return int(x // self.chunk_width)
+
+    def update(self, view_left, view_right):
+        """Load the chunks around the view and unload the ones that left the window"""
+        first = max(0, self.chunk_index(view_left) - self.load_behind)
+        last = self.chunk_index(view_right) + self.load_ahead
+        self.window_first = first
+        self._collect_ready(first, last + self.lookahead)
+
+        stale = [index for index in self.chunks if index < first or index > last]
+        for index in stale:
+            self.unload(index)
+        for index in range(first, last + 1):
+            if index not in self.chunks:
+                self.load(index)
+
+        # Queue the chunks just past the loaded window for background generation
+        if self.worker is not None:
+            for index in range(last + 1, last + self.lookahead + 1):
+                if index not in self.ready and index not in self.requested:
+                    self.requested.add(index)
+                    self.requests.put(index)
+
+    def load(self, index):
+        """Spawn a chunk, using its pre-generated plan if the worker has finished it"""
+        plan = self.ready.pop(index, None)
+        if plan is None:
+            # Not generated ahead of time (first load, or the player outran the worker)
+            plan = self.generate(index)
+            self.sync_loads += 1
+            if self.finish_chunk is not None:
+                self.finish_chunk(index, plan)
+        chunk = Chunk(index, index * self.chunk_width, self.chunk_width, plan)
+        self.spawn_chunk(chunk)
+        self.chunks[index] = chunk
+        return chunk
+
+    def generate(self, index):
+        """Plan and prepare a chunk; safe to call from the worker thread"""
+        plan = self.plan_chunk(index, self.chunk_rng(index))
+        if self.prepare_chunk is not None:
+            self.prepare_chunk(index, plan)
+        return plan
+
+    def unload(self, index):
+        """Despawn a chunk and everything it owns"""
+        chunk = self.chunks.pop(index)
+        self.despawn_chunk(chunk)
+
+    def unload_all(self):
+        """Despawn every loaded chunk"""
+        for index in list(self.chunks):
+            self.unload(index)
+
+    def stop(self):
+        """Stop the background generator thread"""
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker.join(timeout=1.0)
+            self.worker = None
+
+    def is_collected(self, chunk_index, star_key):
+        """Whether a star was already collected in an earlier visit to its chunk"""
+        return (chunk_index, star_key) in self.collected
+
+    def mark_collected(self, chunk_index, star_key):
+        """Remember a collected star so reloading its chunk does not respawn it"""
+        self.collected.add((chunk_index, star_key))
+
+    def _collect_ready(self, first, last):
+        """Take finished chunks from the worker without blocking"""
+        if self.worker is None:
+            return
+        while True:
+            try:
+                index, plan, error = self.completed.get_nowait()
+            except queue.Empty:
+                break
+            self.requested.discard(index)
+            if error is not None:
+                print(f"Error generating chunk {index}: {error!r}")
+            elif plan is not None and index not in self.chunks:
+                if self.finish_chunk is not None:
+                    self.finish_chunk(index, plan)
+                self.ready[index] = plan
+
+        # Drop pre-generated chunks the player has moved away from
+        stale = [index for index in self.ready if index < first or index > last]
+        for index in stale:
+            del self.ready[index]
+
+    def _work(self):
+        """Worker thread: generate requested chunks into the completed queue"""
+        while True:
+            index = self.requests.get()
+            if index is None:
+                return
+            # Skip requests the view has already scrolled past
+            if index < self.window_first:
+                self.completed.put((index, None, None))
+                continue
+            # Report failures to the main thread instead of letting the worker die
+            try:
+                self.completed.put((index, self.generate(index), None))
+            except Exception as e:
+                self.completed.put((index, None, e))
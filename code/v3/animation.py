@@ -0,0 +1,69 @@
+"""
+Sprite animation atlas
+Every animation's frames are loaded once, scaled, and stored with pre-flipped
+copies and anchor offsets. Frames are picked from a global tick, so drawing an
+animated entity is one lookup and one blit with no per-entity timers.
+"""
+import os
+import pygame
+from asset_pack import load_image, list_assets
+
+class AnimationAtlas:
+    def __init__(self):
+        # (animation, state) -> (frames facing the source direction, flipped frames, ticks per frame)
+        # where each frame is (surface, x offset, y offset) from the entity's bottom-centre
+        self.animations = {}
+
+    def add(self, animation, state, surfaces, ticks_per_frame=8):
+        """Add a state from surfaces, anchored at their bottom-centre"""
+        frames = []
+        flipped = []
+        for surface in surfaces:
+            offset = (-surface.get_width() // 2, -surface.get_height())
+            frames.append((surface, *offset))
+            flipped.append((pygame.transform.flip(surface, True, False), *offset))
+        self.animations[(animation, state)] = (frames, flipped, ticks_per_frame)
+
+    def load(self, animation, directory, states, height=None, ticks_per_frame=8):
+        """Load numbered frames (1.png, 2.png, ...) for each state from directory/state/
+
+        Frames are scaled to height, keeping their aspect ratio. Returns the states
+        that had no frames, so the caller can supply fallbacks.
+        """
+        missing = []
+        for state in states:
+            surfaces = []
+            for name in self._frame_names(directory, state):
+                try:
+                    surface = load_image(f"{directory}/{state}/{name}")
+                except (pygame.error, FileNotFoundError) as e:
+                    print(f"Error loading animation frame: {directory}/{state}/{name} ({e})")
+                    continue
+                if height is not None and surface.get_height() != height:
+                    width = round(surface.get_width() * height / surface.get_height())
+                    surface = pygame.transform.smoothscale(surface, (width, height))
+                if pygame.display.get_surface() is not None:
+                    surface = surface.convert_alpha()
+                surfaces.append(surface)
+            if surfaces:
+                self.add(animation, state, surfaces, ticks_per_frame)
+            else:
+                missing.append(state)
+        return missing
+
+    def frame(self, animation, state, tick, flip=False):
+        """The (surface, x offset, y offset) to draw for a state at a global tick"""
+        frames, flipped, ticks_per_frame = self.animations[(animation, state)]
+        frames = flipped if flip else frames
+        return frames[(tick // ticks_per_frame) % len(frames)]
+
+    def draw(self, surface, animation, state, tick, anchor, flip=False):
+        """Blit the current frame with its bottom-centre at anchor"""
+        image, offset_x, offset_y = self.frame(animation, state, tick, flip)
+        surface.blit(image, (anchor[0] + offset_x, anchor[1] + offset_y))
+
+    @staticmethod
+    def _frame_names(directory, state):
+        """Numbered frame files for a state, in frame order"""
+        names = [name for name in list_assets(f"{directory}/{state}") if os.path.splitext(name)[0].isdigit()]
+        return sorted(names, key=lambda name: int(os.path.splitext(name)[0]))
@@ -0,0 +1,162 @@
+"""
+Packed asset archive reader
+Assets built into assets.pak by pack_assets.py are read from one memory-mapped
+file by name; anything not in the archive is loaded from the assets/ tree.
+
+Members are never read into memory as a whole, but reads do copy: pygame
+decodes through a file-object interface, so each read copies the requested
+range out of the mapping once (no file open, seek or syscall per asset).
+
+Archive layout (little-endian):
+    header   b'PAK1', entry count (u32), table of contents offset (u64)
+    data     each member's bytes, 16-byte aligned
+    toc      per entry: name length (u16), UTF-8 name, offset (u64), size (u64)
+"""
+import io
+import mmap
+import os
+import struct
+import pygame
+import startup_trace
+
+PACK_MAGIC = b'PAK1'
+HEADER = struct.Struct('<4sIQ')
+ENTRY = struct.Struct('<QQ')
+NAME_LENGTH = struct.Struct('<H')
+ALIGNMENT = 16
+
+ASSETS_DIR = 'assets'
+PACK_PATH = 'assets.pak'
+
+class PackView(io.RawIOBase):
+    """Read-only file object over one archive member of the mapping"""
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        """Copy up to size bytes out of the mapping (pygame reads through this)"""
+        end = len(self.data) if size is None or size < 0 else min(len(self.data), self.position + size)
+        data = bytes(self.data[self.position:end])
+        self.position = max(self.position, end)
+        return data
+
+    def readinto(self, buffer):
+        count = min(len(buffer), len(self.data) - self.position)
+        buffer[:count] = self.data[self.position:self.position + count]
+        self.position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.data)
+        self.position = max(0, min(offset, len(self.data)))
+        return self.position
+
+    def tell(self):
+        return self.position
+
+class AssetPack:
+    def __init__(self, path):
+        """Map an archive and read its table of contents"""
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, count, toc_offset = HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"Not an asset pack: {path}")
+        self.entries = {}
+        position = toc_offset
+        for _ in range(count):
+            (name_length,) = NAME_LENGTH.unpack_from(self.map, position)
+            position += NAME_LENGTH.size
+            name = bytes(self.view[position:position + name_length]).decode('utf-8')
+            position += name_length
+            self.entries[name] = ENTRY.unpack_from(self.map, position)
+            position += ENTRY.size
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        """Every member name, as a path relative to the assets directory"""
+        return list(self.entries)
+
+    def data(self, name):
+        """A memoryview of a member's bytes inside the mapping"""
+        offset, size = self.entries[name]
+        return self.view[offset:offset + size]
+
+    def open(self, name):
+        """A file object for a member, usable wherever pygame accepts one"""
+        return PackView(self.data(name))
+
+    def close(self):
+        """Unmap the archive; views returned earlier become invalid"""
+        self.view.release()
+        self.map.close()
+        self.file.close()
+
+# Archive shared by the whole game, opened on first use
+_pack = None
+_pack_checked = False
+
+def get_pack():
+    """The game's asset pack, or None if assets.pak has not been built"""
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        if os.path.exists(PACK_PATH):
+            try:
+                _pack = AssetPack(PACK_PATH)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Error opening asset pack: {PACK_PATH} ({e})")
+    return _pack
+
+def open_asset(name):
+    """Open an asset by its path under assets/, from the pack if it is there"""
+    pack = get_pack()
+    if pack is not None and name in pack:
+        return pack.open(name)
+    return open(os.path.join(ASSETS_DIR, *name.split('/')), 'rb')
+
+def list_assets(directory):
+    """Names of the files directly inside an asset directory, from the pack and the assets/ tree"""
+    prefix = directory.rstrip('/') + '/'
+    names = set()
+    pack = get_pack()
+    if pack is not None:
+        for name in pack.names():
+            if name.startswith(prefix) and '/' not in name[len(prefix):]:
+                names.add(name[len(prefix):])
+    try:
+        names.update(os.listdir(os.path.join(ASSETS_DIR, *directory.split('/'))))
+    except OSError:
+        pass
+    return sorted(names)
+
+def load_image(name):
+    """Load an image asset"""
+    with startup_trace.span(name, 'asset'), open_asset(name) as f:
+        return pygame.image.load(f, name)
+
+def load_sound(name):
+    """Load a sound effect asset"""
+    with startup_trace.span(name, 'asset'), open_asset(name) as f:
+        return pygame.mixer.Sound(file=f)
+
+def load_font(name, size):
+    """Load a font asset; the font keeps reading from the file it was given"""
+    with startup_trace.span(f"{name} ({size}px)", 'asset'):
+        return pygame.font.Font(open_asset(name), size)
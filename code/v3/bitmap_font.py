@@ -0,0 +1,132 @@
+"""
+Bitmap font renderer
+A font's glyphs are rasterized once per size into an atlas (kept in a disk
+cache between runs), and text is drawn by blitting glyph subsurfaces, so
+neither startup nor drawing goes through FreeType once the cache exists.
+"""
+import hashlib
+import json
+import os
+import pygame
+from asset_pack import open_asset, load_font
+
+# Printable ASCII; other characters are drawn as '?'
+DEFAULT_CHARSET = ''.join(chr(code) for code in range(32, 127))
+FONT_CACHE_DIR = '.font_cache'
+# Bump when the atlas layout changes so old cache entries are ignored
+ATLAS_VERSION = 1
+ATLAS_WIDTH = 512
+
+class BitmapFont:
+    def __init__(self, font_name, size, charset=DEFAULT_CHARSET, cache_dir=FONT_CACHE_DIR):
+        self.font_name = font_name
+        self.size_px = size
+        self.charset = charset
+        self.cache_dir = cache_dir
+
+        # White glyph atlas, with each glyph's rect in it
+        self.atlas, self.glyph_rects, self.height = self._load_atlas()
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert_alpha()
+        # Glyph subsurfaces per text colour, built on first use
+        self.colored = {}
+
+    def size(self, text):
+        """Width and height of a line of text"""
+        rects = self.glyph_rects
+        fallback = rects.get('?')
+        return sum(rects.get(char, fallback)[2] for char in text), self.height
+
+    def draw(self, surface, text, position, color=(255, 255, 255)):
+        """Draw a line of text with its top-left at position; returns its width"""
+        glyphs = self._glyphs(color)
+        fallback = glyphs.get('?')
+        x, y = position
+        start = x
+        for char in text:
+            glyph = glyphs.get(char, fallback)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return x - start
+
+    def draw_centered(self, surface, text, center, color=(255, 255, 255)):
+        """Draw a line of text centred on a point"""
+        width, height = self.size(text)
+        self.draw(surface, text, (center[0] - width // 2, center[1] - height // 2), color)
+
+    def _glyphs(self, color):
+        """Glyph subsurfaces of an atlas tinted to color"""
+        color = tuple(color)
+        glyphs = self.colored.get(color)
+        if glyphs is None:
+            atlas = self.atlas.copy()
+            # White glyphs times the colour keep their antialiased alpha
+            atlas.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+            glyphs = {char: atlas.subsurface(rect) for char, rect in self.glyph_rects.items()}
+            self.colored[color] = glyphs
+        return glyphs
+
+    def _cache_key(self):
+        """Identifies an atlas by font contents, size and charset"""
+        with open_asset(self.font_name) as f:
+            digest = hashlib.sha1(f.read())
+        digest.update(json.dumps([ATLAS_VERSION, self.size_px, self.charset]).encode())
+        return digest.hexdigest()
+
+    def _load_atlas(self):
+        """Load the atlas from the disk cache, rasterizing and caching it on a miss"""
+        try:
+            key = self._cache_key()
+        except OSError:
+            key = None
+        if key is not None:
+            image_path = os.path.join(self.cache_dir, key + '.png')
+            metrics_path = os.path.join(self.cache_dir, key + '.json')
+            try:
+                with open(metrics_path) as f:
+                    metrics = json.load(f)
+                atlas = pygame.image.load(image_path)
+                rects = {char: pygame.Rect(rect) for char, rect in metrics['glyphs'].items()}
+                return atlas, rects, metrics['height']
+            except (OSError, ValueError, KeyError, pygame.error):
+                pass
+
+        atlas, rects, height = self._rasterize()
+        if key is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                pygame.image.save(atlas, image_path)
+                with open(metrics_path, 'w') as f:
+                    json.dump({'height': height, 'glyphs': {char: list(rect) for char, rect in rects.items()}}, f)
+            except (OSError, pygame.error) as e:
+                print(f"Error caching font atlas: {e}")
+        return atlas, rects, height
+
+    def _rasterize(self):
+        """Render every glyph once into a white atlas"""
+        try:
+            font = load_font(self.font_name, self.size_px)
+        except (OSError, pygame.error) as e:
+            # pygame's built-in default font, which needs no system font scan
+            print(f"Error loading font: {self.font_name} ({e})")
+            font = pygame.font.Font(None, self.size_px)
+
+        height = font.get_height()
+        images = [(char, font.render(char, True, (255, 255, 255))) for char in self.charset]
+        if '?' not in self.charset:
+            images.append(('?', font.render('?', True, (255, 255, 255))))
+
+        # Pack glyphs into rows
+        rects = {}
+        x = y = 0
+        for char, image in images:
+            width = image.get_width()
+            if x + width > ATLAS_WIDTH:
+                x = 0
+                y += height
+            rects[char] = pygame.Rect(x, y, width, height)
+            x += width
+        atlas = pygame.Surface((ATLAS_WIDTH, y + height), pygame.SRCALPHA)
+        for char, image in images:
+            atlas.blit(image, rects[char])
+        return atlas, rects, height
@@ -0,0 +1,120 @@
+"""
+Entity-component store
+Entities are integer ids. Each component type lives in its own dense array,
+so a system iterates only over the entities that have the components it needs,
+and creating or destroying an entity is O(1) per component type.
+"""
+
+class ComponentStore:
+    """Dense array of one component type, with O(1) add, lookup and swap-remove"""
+    def __init__(self):
+        self.data = []
+        self.entities = []
+        self.index = {}
+
+    def add(self, entity, component):
+        if entity in self.index:
+            self.data[self.index[entity]] = component
+            return component
+        self.index[entity] = len(self.data)
+        self.entities.append(entity)
+        self.data.append(component)
+        return component
+
+    def remove(self, entity):
+        """Remove an entity's component by moving the last one into its slot"""
+        slot = self.index.pop(entity)
+        last_entity = self.entities.pop()
+        last = self.data.pop()
+        if slot < len(self.data):
+            self.entities[slot] = last_entity
+            self.data[slot] = last
+            self.index[last_entity] = slot
+
+    def get(self, entity, default=None):
+        slot = self.index.get(entity)
+        return default if slot is None else self.data[slot]
+
+    def __contains__(self, entity):
+        return entity in self.index
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        """(entity, component) pairs in storage order"""
+        return zip(self.entities, self.data)
+
+class EntityStore:
+    def __init__(self):
+        self.stores = {}
+        self.next_entity = 0
+
+    def create(self, **components):
+        """Create an entity, optionally with components given as name=value"""
+        entity = self.next_entity
+        self.next_entity += 1
+        for name, component in components.items():
+            self.add(entity, name, component)
+        return entity
+
+    def destroy(self, entity):
+        """Remove an entity and all of its components"""
+        for store in self.stores.values():
+            if entity in store:
+                store.remove(entity)
+
+    def add(self, entity, name, component):
+        """Attach a component to an entity"""
+        store = self.stores.get(name)
+        if store is None:
+            store = self.stores[name] = ComponentStore()
+        return store.add(entity, component)
+
+    def remove(self, entity, name):
+        """Detach a component from an entity if it has one"""
+        store = self.stores.get(name)
+        if store is not None and entity in store:
+            store.remove(entity)
+
+    def get(self, entity, name, default=None):
+        store = self.stores.get(name)
+        return default if store is None else store.get(entity, default)
+
+    def has(self, entity, name):
+        store = self.stores.get(name)
+        return store is not None and entity in store
+
+    def store(self, name):
+        """The dense store for a component type (created empty if needed)"""
+        store = self.stores.get(name)
+        if store is None:
+            store = self.stores[name] = ComponentStore()
+        return store
+
+    def count(self, name):
+        """Number of entities with a component"""
+        store = self.stores.get(name)
+        return 0 if store is None else len(store)
+
+    def query(self, *names):
+        """Yield (entity, component, ...) for every entity that has all the named components
+
+        Iterates the smallest of the stores, so the cost follows the rarest component.
+        The stores must not be changed while iterating; collect entities to destroy first.
+        """
+        stores = [self.store(name) for name in names]
+        smallest = min(stores, key=len)
+        for entity in smallest.entities:
+            components = []
+            for store in stores:
+                slot = store.index.get(entity)
+                if slot is None:
+                    break
+                components.append(store.data[slot])
+            else:
+                yield (entity, *components)
+
+    def clear(self):
+        """Destroy every entity"""
+        self.stores.clear()
@@ -2,17 +2,34 @@
 Fixed Platform Game with Replay Feature
 This is a simplified version that works without requiring external assets
 """
-import pygame
-import sys
 import os
-import time
-import copy
-import random  # Added for enemy movement randomization
-import math    # Added for sound generation
+import sys
+# Modules shared by every version live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import startup_trace  # First after the path, so the rest of startup is measured
+with startup_trace.span('imports'):
+    import pygame
+    import sys
+    import os
+    import time
+    import copy
+    import random  # Added for enemy movement randomization
+    import math    # Added for sound generation
+    from music import MusicPlayer
+    from animation import AnimationAtlas
+    from bitmap_font import BitmapFont
+    from ecs import EntityStore
+    from asset_pack import load_sound
+    from events import EventQueue, EventCounter, ALL_EVENTS, JUMP, LAND, STOMP, PICKUP, DEATH, LEVEL_COMPLETE
+    import audio_profile
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()  # Initialize sound mixer
+# Initialize pygame, opening the mixer with the configured audio profile
+# (the synthesized sounds below assume 44100 Hz, 16-bit samples)
+with startup_trace.span('pygame.init'):
+    audio_profile.pre_init()
+    pygame.init()
+with startup_trace.span('mixer.init'):
+    pygame.mixer.init()  # Initialize sound mixer
 
 # Screen settings
 SCREEN_WIDTH = 800
@@ -36,63 +53,104 @@ enemy_defeat_sound = None
 game_over_sound = None
 level_complete_sound = None
 
+def load_sound_file(name):
+    """A sound effect from the asset pack, or None if it is missing or has no samples"""
+    try:
+        sound = load_sound(name)
+    except (pygame.error, OSError) as e:
+        print(f"Error loading sound: {name} ({e})")
+        return None
+    return sound if sound.get_length() > 0 else None
+
 def load_sounds():
     global jump_sound, star_sound, enemy_defeat_sound, game_over_sound, level_complete_sound
     
-    # Create simple sound effects using sine waves
+    # Sound files from the asset pack
+    jump_sound = load_sound_file('audio/jump.wav')
+    star_sound = load_sound_file('audio/coin.wav')
+    enemy_defeat_sound = load_sound_file('audio/stomp.wav')
+    game_over_sound = load_sound_file('audio/game_over.wav')
+    level_complete_sound = load_sound_file('audio/level_complete.wav')
+    
+    # Synthesize simple sound effects using sine waves for any without a usable file
     sample_rate = 44100
     
     # Jump sound - rising tone
-    jump_buffer = bytearray()
-    for i in range(int(0.2 * sample_rate)):  # 0.2 seconds
-        t = i / sample_rate
-        freq = 440 + (i / (0.2 * sample_rate)) * 220  # Rising from 440Hz to 660Hz
-        sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
-        # Convert to 16-bit little-endian bytes
-        jump_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
-    jump_sound = pygame.mixer.Sound(buffer=bytes(jump_buffer))
+    if jump_sound is None:
+        jump_buffer = bytearray()
+        for i in range(int(0.2 * sample_rate)):  # 0.2 seconds
+            t = i / sample_rate
+            freq = 440 + (i / (0.2 * sample_rate)) * 220  # Rising from 440Hz to 660Hz
+            sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
+            # Convert to 16-bit little-endian bytes
+            jump_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
+        jump_sound = pygame.mixer.Sound(buffer=bytes(jump_buffer))
     
     # Star sound - high ping with shimmer
-    star_buffer = bytearray()
-    for i in range(int(0.2 * sample_rate)):  # 0.2 seconds
-        t = i / sample_rate
-        # Base frequency with shimmer effect
-        freq = 988 + 100 * math.sin(2 * math.pi * 10 * t)
-        sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
-        star_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
-    star_sound = pygame.mixer.Sound(buffer=bytes(star_buffer))
+    if star_sound is None:
+        star_buffer = bytearray()
+        for i in range(int(0.2 * sample_rate)):  # 0.2 seconds
+            t = i / sample_rate
+            # Base frequency with shimmer effect
+            freq = 988 + 100 * math.sin(2 * math.pi * 10 * t)
+            sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
+            star_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
+        star_sound = pygame.mixer.Sound(buffer=bytes(star_buffer))
     
     # Enemy defeat sound - descending tone
-    enemy_buffer = bytearray()
-    for i in range(int(0.3 * sample_rate)):  # 0.3 seconds
-        t = i / sample_rate
-        freq = 660 - (i / (0.3 * sample_rate)) * 440  # Descending from 660Hz to 220Hz
-        sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
-        enemy_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
-    enemy_defeat_sound = pygame.mixer.Sound(buffer=bytes(enemy_buffer))
-    
-    # Game over sound - descending tones
-    game_over_buffer = bytearray()
-    freqs = [440, 349, 329, 220]
-    for freq in freqs:
-        for i in range(int(0.15 * sample_rate)):  # 0.15 seconds per note
+    if enemy_defeat_sound is None:
+        enemy_buffer = bytearray()
+        for i in range(int(0.3 * sample_rate)):  # 0.3 seconds
             t = i / sample_rate
+            freq = 660 - (i / (0.3 * sample_rate)) * 440  # Descending from 660Hz to 220Hz
             sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
-            game_over_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
-    game_over_sound = pygame.mixer.Sound(buffer=bytes(game_over_buffer))
+            enemy_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
+        enemy_defeat_sound = pygame.mixer.Sound(buffer=bytes(enemy_buffer))
+    
+    # Game over sound - descending tones
+    if game_over_sound is None:
+        game_over_buffer = bytearray()
+        freqs = [440, 349, 329, 220]
+        for freq in freqs:
+            for i in range(int(0.15 * sample_rate)):  # 0.15 seconds per note
+                t = i / sample_rate
+                sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
+                game_over_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
+        game_over_sound = pygame.mixer.Sound(buffer=bytes(game_over_buffer))
     
     # Level complete sound - ascending tones
-    level_buffer = bytearray()
-    freqs = [523, 659, 784, 1047]
-    for freq in freqs:
-        for i in range(int(0.15 * sample_rate)):  # 0.15 seconds per note
-            t = i / sample_rate
-            sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
-            level_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
-    level_complete_sound = pygame.mixer.Sound(buffer=bytes(level_buffer))
+    if level_complete_sound is None:
+        level_buffer = bytearray()
+        freqs = [523, 659, 784, 1047]
+        for freq in freqs:
+            for i in range(int(0.15 * sample_rate)):  # 0.15 seconds per note
+                t = i / sample_rate
+                sample = int(32767 * 0.5 * math.sin(2 * math.pi * freq * t))
+                level_buffer.extend(sample.to_bytes(2, byteorder='little', signed=True))
+        level_complete_sound = pygame.mixer.Sound(buffer=bytes(level_buffer))
+        
+    EVENT_SOUNDS.update({
+        JUMP: jump_sound,
+        STOMP: enemy_defeat_sound,
+        PICKUP: star_sound,
+        DEATH: game_over_sound,
+        LEVEL_COMPLETE: level_complete_sound
+    })
 
-# Load sounds
-load_sounds()
+# Sound played for each kind of gameplay event, filled in by load_sounds() when
+# the first game with audio is created
+EVENT_SOUNDS = {}
+
+def play_event_sounds(events):
+    """Audio handler: one sound per kind of event each frame, however many happened"""
+    sound = EVENT_SOUNDS.get(events[0].kind)
+    if sound:
+        sound.play()
+
+# Background music per level, streamed from disk
+LEVEL_MUSIC = {
+    1: 'audio/level_1.mp3'
+}
 
 def load_player_sprite():
     """Create a simple player sprite"""
@@ -169,200 +227,292 @@ JUMP_STRENGTH = -12  # Adjusted from -15 to -12 for more controlled jumps
 PLAYER_SPEED = 5
 
 # Create screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Platform Game - Fixed Version')
+with startup_trace.span('set_mode'):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption('Platform Game - Fixed Version')
 clock = pygame.time.Clock()
 
-# Font
-font = pygame.font.SysFont('Arial', 24)
-title_font = pygame.font.SysFont('Arial', 48)
+# Font, drawn from glyph atlases of the bundled font
+FONT_NAME = 'fonts/PlatformStyle256.ttf'
+with startup_trace.span('fonts'):
+    font = BitmapFont(FONT_NAME, 16)
+    title_font = BitmapFont(FONT_NAME, 32)
 
-# Player
-class Player:
-    def __init__(self):
-        self.rect = pygame.Rect(100, SCREEN_HEIGHT - 100, 32, 32)
-        self.velocity = pygame.Vector2(0, 0)
+# Animations, loaded once and shared by every entity
+PLAYER_STATES = ('idle', 'run', 'jump', 'fall')
+animations = AnimationAtlas()
+with startup_trace.span('animations'):
+    for state in animations.load('player', 'graphics/character/small', PLAYER_STATES, height=TILE_SIZE, ticks_per_frame=6):
+        # Fall back to the drawn sprite for states without frames
+        animations.add('player', state, [load_player_sprite()])
+    animations.add('enemy', 'walk', [load_enemy_sprite()])
+pentagram_sprite = load_pentagram_sprite()
+
+# Components
+class Body:
+    """Moves with its velocity and collides with platforms and the screen edges"""
+    def __init__(self, spawn):
+        self.spawn = spawn
         self.on_ground = False
+
+class PlayerStats:
+    """Score and pickups collected by the player"""
+    def __init__(self):
         self.score = 0
         self.pentagrams = 0
-        self.sprite = load_player_sprite()
-        self.facing_right = True
-        
-    def update(self, platforms):
-        # Apply gravity
-        self.velocity.y += GRAVITY
-        
-        # Limit falling speed to prevent passing through platforms
-        if self.velocity.y > 15:
-            self.velocity.y = 15
+
+class Patrol:
+    """Walks back and forth, turning at obstacles and occasionally at random"""
+    def __init__(self, x, y):
+        self.initial_x = x
+        self.initial_y = y
+        self.direction_change_timer = 0
+
+class Pickup:
+    """Collected when the player touches it; shown with sprite until then"""
+    def __init__(self, value, sprite):
+        self.value = value
+        self.sprite = sprite
+        self.collected = False
+
+class Animation:
+    """Animation atlas entry, facing and state driven by velocity"""
+    def __init__(self, name, state, art_faces_right=True, states_from_velocity=False):
+        self.name = name
+        self.state = state
+        self.art_faces_right = art_faces_right
+        self.facing_right = art_faces_right
+        self.states_from_velocity = states_from_velocity
+
+# Entity factories
+def create_player(entities):
+    spawn = (100, SCREEN_HEIGHT - 100)
+    return entities.create(
+        rect=pygame.Rect(spawn[0], spawn[1], 32, 32),
+        velocity=pygame.Vector2(0, 0),
+        gravity=15,  # Limit falling speed to prevent passing through platforms
+        body=Body(spawn),
+        player=PlayerStats(),
+        animation=Animation('player', 'idle', states_from_velocity=True)
+    )
+
+def create_enemy(entities, x, y):
+    return entities.create(
+        rect=pygame.Rect(x, y, 32, 32),
+        velocity=pygame.Vector2(-2, 0),
+        patrol=Patrol(x, y),
+        stompable=100,
+        animation=Animation('enemy', 'walk', art_faces_right=False)
+    )
+
+def create_pentagram(entities, x, y):
+    return entities.create(
+        rect=pygame.Rect(x, y, 16, 16),
+        pickup=Pickup(50, pentagram_sprite),
+        uncollected=True,
+        sprite=pentagram_sprite
+    )
+
+# Systems
+def gravity_system(entities):
+    """Accelerate falling entities up to their terminal speed"""
+    for entity, velocity, max_fall in entities.query('velocity', 'gravity'):
+        velocity.y += GRAVITY
+        if velocity.y > max_fall:
+            velocity.y = max_fall
+
+def movement_system(entities, platforms, events):
+    """Move bodies one axis at a time, resolving platform collisions"""
+    for entity, rect, velocity, body in entities.query('rect', 'velocity', 'body'):
+        was_on_ground = body.on_ground
         
         # Move horizontally
-        self.rect.x += self.velocity.x
-        
-        # Update facing direction
-        if self.velocity.x > 0:
-            self.facing_right = True
-        elif self.velocity.x < 0:
-            self.facing_right = False
+        rect.x += velocity.x
         
         # Check horizontal collisions
         for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.velocity.x > 0:  # Moving right
-                    self.rect.right = platform.left
-                elif self.velocity.x < 0:  # Moving left
-                    self.rect.left = platform.right
+            if rect.colliderect(platform):
+                if velocity.x > 0:  # Moving right
+                    rect.right = platform.left
+                elif velocity.x < 0:  # Moving left
+                    rect.left = platform.right
         
         # Move vertically
-        self.rect.y += self.velocity.y
-        self.on_ground = False
+        rect.y += velocity.y
+        body.on_ground = False
         
         # Check vertical collisions
         for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.velocity.y > 0:  # Moving down
-                    self.rect.bottom = platform.top
-                    self.on_ground = True
-                    self.velocity.y = 0
-                elif self.velocity.y < 0:  # Moving up
-                    self.rect.top = platform.bottom
-                    self.velocity.y = 0
-        
-        # Keep player on screen
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
-        if self.rect.top < 0:
-            self.rect.top = 0
-        
-        # Check if player fell off the screen
-        if self.rect.top > SCREEN_HEIGHT:
-            self.rect.x = 100
-            self.rect.y = SCREEN_HEIGHT - 100
-            self.velocity = pygame.Vector2(0, 0)
-            
-    def jump(self):
-        if self.on_ground:
-            self.velocity.y = JUMP_STRENGTH
-            # Play jump sound
-            if jump_sound:
-                jump_sound.play()
-            
-    def draw(self):
-        # Draw the sprite instead of a rectangle
-        if self.facing_right:
-            screen.blit(self.sprite, self.rect)
-        else:
-            # Flip the sprite if facing left
-            flipped_sprite = pygame.transform.flip(self.sprite, True, False)
-            screen.blit(flipped_sprite, self.rect)
-
-# Enemy
-class Enemy:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 32, 32)
-        self.velocity = pygame.Vector2(-2, 0)
-        self.initial_x = x
-        self.initial_y = y
-        self.direction_change_timer = 0
-        self.sprite = load_enemy_sprite()
-        self.direction_change_timer = 0
+            if rect.colliderect(platform):
+                if velocity.y > 0:  # Moving down
+                    rect.bottom = platform.top
+                    body.on_ground = True
+                    velocity.y = 0
+                elif velocity.y < 0:  # Moving up
+                    rect.top = platform.bottom
+                    velocity.y = 0
+        if body.on_ground and not was_on_ground:
+            events.emit(LAND, rect.centerx, rect.bottom, entity=entity)
+        
+        # Keep on screen
+        if rect.left < 0:
+            rect.left = 0
+        if rect.right > SCREEN_WIDTH:
+            rect.right = SCREEN_WIDTH
+        if rect.top < 0:
+            rect.top = 0
         
-    def update(self, platforms):
+        # Respawn after falling off the screen
+        if rect.top > SCREEN_HEIGHT:
+            rect.topleft = body.spawn
+            velocity.update(0, 0)
+
+def patrol_system(entities, platforms):
+    """Walk patrolling entities, turning at platforms, screen edges and at random"""
+    for entity, rect, velocity, patrol in entities.query('rect', 'velocity', 'patrol'):
         # Move horizontally
-        self.rect.x += self.velocity.x
+        rect.x += velocity.x
         
         # Check for collisions or edges
-        collision = False
         for platform in platforms:
-            if self.rect.colliderect(platform):
-                self.velocity.x *= -1
-                collision = True
+            if rect.colliderect(platform):
+                velocity.x *= -1
                 break
                 
-        if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
-            self.velocity.x *= -1
+        if rect.left < 0 or rect.right > SCREEN_WIDTH:
+            velocity.x *= -1
             
         # Occasionally change direction to make movement less predictable
-        self.direction_change_timer += 1
-        if self.direction_change_timer > 180:  # Change direction every ~3 seconds
+        patrol.direction_change_timer += 1
+        if patrol.direction_change_timer > 180:  # Change direction every ~3 seconds
             if random.random() < 0.3:  # 30% chance to change direction
-                self.velocity.x *= -1
-            self.direction_change_timer = 0
-            
-    def draw(self):
-        # Draw the sprite instead of a rectangle
-        if self.velocity.x > 0:
-            # Flip sprite if moving right
-            flipped_sprite = pygame.transform.flip(self.sprite, True, False)
-            screen.blit(flipped_sprite, self.rect)
+                velocity.x *= -1
+            patrol.direction_change_timer = 0
+
+def stomp_system(entities, player, events):
+    """Resolve player contact with stompable entities; returns True if the player was hit"""
+    player_rect = entities.get(player, 'rect')
+    player_velocity = entities.get(player, 'velocity')
+    stats = entities.get(player, 'player')
+    stomped = []
+    hit = False
+    for entity, rect, points in entities.query('rect', 'stompable'):
+        if not player_rect.colliderect(rect):
+            continue
+        # Stomp if the player is falling down and is mostly above the enemy
+        if (player_velocity.y > 0 and
+            player_rect.bottom < rect.top + 15 and
+            player_rect.bottom > rect.top - 10):
+            stomped.append(entity)
+            player_velocity.y = JUMP_STRENGTH / 2
+            stats.score += points
+            events.emit(STOMP, rect.centerx, rect.centery, points, entity)
         else:
-            screen.blit(self.sprite, self.rect)
-        
-    def reset(self):
-        self.rect.x = self.initial_x
-        self.rect.y = self.initial_y
-        self.velocity = pygame.Vector2(-2, 0)
+            hit = True
+    
+    # Destroy stomped entities after iteration is complete
+    for entity in stomped:
+        entities.destroy(entity)
+    return hit
 
-# Pentagram (previously a star)
-class Pentagram:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 16, 16)
-        self.collected = False
-        self.x = x
-        self.y = y
-        self.sprite = load_pentagram_sprite()
-        self.bob_offset = 0
-        self.bob_direction = 1
-        self.bob_speed = 0.2
-        self.rotation = 0  # Add rotation for the star
-        self.rotation_speed = 2  # Degrees per frame
-    def update(self):
-        if not self.collected:
-            # Make the star bob up and down
-            self.bob_offset += self.bob_speed * self.bob_direction
-            if abs(self.bob_offset) > 3:
-                self.bob_direction *= -1
-            
-            # Update the rect position with the bob offset
-            self.rect.y = self.y + self.bob_offset
-            
-            # Rotate the star
-            self.rotation = (self.rotation + self.rotation_speed) % 360
-        
-    def draw(self):
-        if not self.collected:
-            # Rotate the sprite
-            rotated_sprite = pygame.transform.rotate(self.sprite, self.rotation)
-            # Get the rect of the rotated sprite to center it
-            rect = rotated_sprite.get_rect(center=self.rect.center)
-            screen.blit(rotated_sprite, rect)
-            
-    def reset(self):
-        self.collected = False
-        self.bob_offset = 0
-        self.bob_direction = 1
+def pickup_system(entities, player, events):
+    """Collect pickups the player touches; returns the entities collected"""
+    player_rect = entities.get(player, 'rect')
+    stats = entities.get(player, 'player')
+    # Only pickups still in play are tested; collect after iteration is complete
+    touched = [(entity, rect, pickup) for entity, rect, pickup, _ in entities.query('rect', 'pickup', 'uncollected')
+               if player_rect.colliderect(rect)]
+    for entity, rect, pickup in touched:
+        set_collected(entities, entity, True)
+        stats.pentagrams += 1
+        stats.score += pickup.value
+        events.emit(PICKUP, rect.centerx, rect.centery, pickup.value, entity)
+    return [entity for entity, rect, pickup in touched]
+
+def set_collected(entities, entity, collected):
+    """Mark a pickup collected or not
 
-# Game state for replay
+    A collected pickup leaves the uncollected set and loses its sprite, so neither
+    collision checks nor drawing iterate over it; replays can put it back.
+    """
+    pickup = entities.get(entity, 'pickup')
+    if pickup.collected == collected:
+        return
+    pickup.collected = collected
+    if collected:
+        entities.remove(entity, 'uncollected')
+        entities.remove(entity, 'sprite')
+    else:
+        entities.add(entity, 'uncollected', True)
+        entities.add(entity, 'sprite', pickup.sprite)
+
+def animation_system(entities):
+    """Update facing and animation state from velocity"""
+    for entity, animation, velocity in entities.query('animation', 'velocity'):
+        if velocity.x > 0:
+            animation.facing_right = True
+        elif velocity.x < 0:
+            animation.facing_right = False
+        if animation.states_from_velocity:
+            # From velocity alone, so it also works during replays
+            if velocity.y < 0:
+                animation.state = 'jump'
+            elif velocity.y > 0:
+                animation.state = 'fall'
+            elif velocity.x != 0:
+                animation.state = 'run'
+            else:
+                animation.state = 'idle'
+
+def render_system(entities, tick, on_top=None):
+    """Draw sprites, then animated entities, with on_top drawn last"""
+    for entity, rect, sprite in entities.query('rect', 'sprite'):
+        screen.blit(sprite, sprite.get_rect(center=rect.center))
+    for entity, rect, animation in entities.query('rect', 'animation'):
+        if entity != on_top:
+            draw_animation(rect, animation, tick)
+    if on_top is not None:
+        draw_animation(entities.get(on_top, 'rect'), entities.get(on_top, 'animation'), tick)
+
+def draw_animation(rect, animation, tick):
+    # Use the pre-flipped frames when facing away from the artwork's direction
+    animations.draw(screen, animation.name, animation.state, tick, rect.midbottom,
+                    flip=animation.facing_right != animation.art_faces_right)
+
+# Game state for replay; enemy and pentagram states are keyed by entity
 class GameState:
-    def __init__(self, player_pos, player_vel, enemy_positions, enemy_velocities, pentagram_states):
+    def __init__(self, player_pos, player_vel, enemy_positions, enemy_velocities, collected):
         self.player_pos = player_pos
         self.player_vel = player_vel
         self.enemy_positions = enemy_positions
         self.enemy_velocities = enemy_velocities
-        self.pentagram_states = pentagram_states
+        # Pentagrams collected on this frame only; the rest follow from earlier frames
+        self.collected = collected
 
 # Game
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False):
+        """headless skips sounds and telemetry, so a pure simulation does no work for them"""
         self.state = 'menu'  # menu, playing, game_over, win, replay
-        self.player = Player()
+        self.entities = EntityStore()
+        self.player = None
         self.platforms = []
-        self.enemies = []
-        self.pentagrams = []
         self.current_level = 1
         self.max_levels = 3
+        
+        # Gameplay events, handled once per frame after the simulation step. Only
+        # kinds with a handler are queued; the replay handler is subscribed while
+        # recording, so a headless game without a recording queues nothing.
+        self.events = EventQueue()
+        self.event_counts = EventCounter()
+        if not headless:
+            if not EVENT_SOUNDS:
+                with startup_trace.span('load sounds'):
+                    load_sounds()
+            self.events.subscribe(self.event_counts, *ALL_EVENTS)
+            self.events.subscribe(play_event_sounds, JUMP, STOMP, PICKUP, DEATH, LEVEL_COMPLETE)
+            self.events.subscribe(self.preload_next_music, LEVEL_COMPLETE)
+        
         self.setup_level(self.current_level)
         
         # Replay system
@@ -370,12 +520,23 @@ class Game:
         self.replay_states = []
         self.replay_index = 0
         self.replay_speed = 1.0
+        # Pentagram states when recording started, and how many recorded
+        # frames' pickups the replay has applied since
+        self.replay_start_pickups = {}
+        self.replay_pickup_frames = 0
+        
+        # Global animation clock
+        self.tick = 0
+        
+        # Background music; disabled when headless, so no end event is set
+        self.music = MusicPlayer(LEVEL_MUSIC, enabled=not headless)
         
     def setup_level(self, level_number=1):
-        # Clear existing objects
+        # Clear existing objects and start a fresh player
         self.platforms = []
-        self.enemies = []
-        self.pentagrams = []
+        self.entities.clear()
+        self.events.clear()
+        self.player = create_player(self.entities)
         
         # Ground
         self.platforms.append(pygame.Rect(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40))
@@ -389,16 +550,16 @@ class Game:
             self.platforms.append(pygame.Rect(400, SCREEN_HEIGHT - 300, 200, 20))  # Lowered from -350
             
             # Enemies
-            self.enemies.append(Enemy(300, SCREEN_HEIGHT - 80))
-            self.enemies.append(Enemy(600, SCREEN_HEIGHT - 220))  # Adjusted for new platform height
+            create_enemy(self.entities, 300, SCREEN_HEIGHT - 80)
+            create_enemy(self.entities, 600, SCREEN_HEIGHT - 220)  # Adjusted for new platform height
             
             # Pentagrams
             for i in range(5):
-                self.pentagrams.append(Pentagram(250 + i*30, SCREEN_HEIGHT - 150))
+                create_pentagram(self.entities, 250 + i*30, SCREEN_HEIGHT - 150)
             for i in range(5):
-                self.pentagrams.append(Pentagram(550 + i*30, SCREEN_HEIGHT - 210))  # Adjusted for new platform height
+                create_pentagram(self.entities, 550 + i*30, SCREEN_HEIGHT - 210)  # Adjusted for new platform height
             for i in range(5):
-                self.pentagrams.append(Pentagram(150 + i*30, SCREEN_HEIGHT - 270))  # Adjusted for new platform height
+                create_pentagram(self.entities, 150 + i*30, SCREEN_HEIGHT - 270)  # Adjusted for new platform height
                 
         elif level_number == 2:
             # Level 2 - More platforms and enemies
@@ -410,22 +571,22 @@ class Game:
             self.platforms.append(pygame.Rect(450, SCREEN_HEIGHT - 300, 150, 20))  # Lowered from -350
             
             # Enemies
-            self.enemies.append(Enemy(150, SCREEN_HEIGHT - 190))
-            self.enemies.append(Enemy(400, SCREEN_HEIGHT - 220))  # Adjusted for new platform height
-            self.enemies.append(Enemy(650, SCREEN_HEIGHT - 190))
-            self.enemies.append(Enemy(250, SCREEN_HEIGHT - 290))  # Adjusted for new platform height
+            create_enemy(self.entities, 150, SCREEN_HEIGHT - 190)
+            create_enemy(self.entities, 400, SCREEN_HEIGHT - 220)  # Adjusted for new platform height
+            create_enemy(self.entities, 650, SCREEN_HEIGHT - 190)
+            create_enemy(self.entities, 250, SCREEN_HEIGHT - 290)  # Adjusted for new platform height
             
             # Pentagrams
             for i in range(3):
-                self.pentagrams.append(Pentagram(120 + i*30, SCREEN_HEIGHT - 180))
+                create_pentagram(self.entities, 120 + i*30, SCREEN_HEIGHT - 180)
             for i in range(3):
-                self.pentagrams.append(Pentagram(370 + i*30, SCREEN_HEIGHT - 210))  # Adjusted for new platform height
+                create_pentagram(self.entities, 370 + i*30, SCREEN_HEIGHT - 210)  # Adjusted for new platform height
             for i in range(3):
-                self.pentagrams.append(Pentagram(620 + i*30, SCREEN_HEIGHT - 180))
+                create_pentagram(self.entities, 620 + i*30, SCREEN_HEIGHT - 180)
             for i in range(3):
-                self.pentagrams.append(Pentagram(220 + i*30, SCREEN_HEIGHT - 280))  # Adjusted for new platform height
+                create_pentagram(self.entities, 220 + i*30, SCREEN_HEIGHT - 280)  # Adjusted for new platform height
             for i in range(3):
-                self.pentagrams.append(Pentagram(470 + i*30, SCREEN_HEIGHT - 330))  # Adjusted for new platform height
+                create_pentagram(self.entities, 470 + i*30, SCREEN_HEIGHT - 330)  # Adjusted for new platform height
                 
         elif level_number == 3:
             # Level 3 - Complex layout with more challenges
@@ -441,53 +602,69 @@ class Game:
             self.platforms.append(pygame.Rect(300, SCREEN_HEIGHT - 220, 200, 20))  # Lowered from -250
             
             # Enemies
-            self.enemies.append(Enemy(150, SCREEN_HEIGHT - 140))
-            self.enemies.append(Enemy(350, SCREEN_HEIGHT - 140))
-            self.enemies.append(Enemy(550, SCREEN_HEIGHT - 140))
-            self.enemies.append(Enemy(250, SCREEN_HEIGHT - 260))  # Adjusted for new platform height
-            self.enemies.append(Enemy(450, SCREEN_HEIGHT - 260))  # Adjusted for new platform height
-            self.enemies.append(Enemy(400, SCREEN_HEIGHT - 350))  # Adjusted height
+            create_enemy(self.entities, 150, SCREEN_HEIGHT - 140)
+            create_enemy(self.entities, 350, SCREEN_HEIGHT - 140)
+            create_enemy(self.entities, 550, SCREEN_HEIGHT - 140)
+            create_enemy(self.entities, 250, SCREEN_HEIGHT - 260)  # Adjusted for new platform height
+            create_enemy(self.entities, 450, SCREEN_HEIGHT - 260)  # Adjusted for new platform height
+            create_enemy(self.entities, 400, SCREEN_HEIGHT - 350)  # Adjusted height
             
             # Pentagrams
             for i in range(20):
                 x = 100 + (i % 5) * 150
                 y = SCREEN_HEIGHT - 180 - (i // 5) * 60  # Adjusted from -200 and *80 to make more accessible
-                self.pentagrams.append(Pentagram(x, y))
+                create_pentagram(self.entities, x, y)
     
     def start_recording(self):
         """Start recording gameplay for replay"""
         self.recording = True
         self.replay_states = []
+        self.replay_start_pickups = {pentagram: pickup.collected for pentagram, pickup in self.entities.store('pickup')}
+        self.events.subscribe(self.end_recording, DEATH, LEVEL_COMPLETE)
         print("Recording started")
         
     def stop_recording(self):
         """Stop recording gameplay"""
         self.recording = False
+        self.events.unsubscribe(self.end_recording, DEATH, LEVEL_COMPLETE)
         print(f"Recording stopped. Captured {len(self.replay_states)} frames")
         
-    def record_state(self):
-        """Record current game state for replay"""
+    def end_recording(self, events):
+        """Replay handler: a run ends when the player dies or completes the level"""
+        if self.recording:
+            self.stop_recording()
+            
+    def preload_next_music(self, events):
+        """Open the next level's music while the win screen is up"""
+        if self.current_level < self.max_levels:
+            self.music.preload(self.current_level + 1)
+            
+    def quit(self, status=0):
+        """Print the event totals and exit with status"""
+        print(f"Events: {self.event_counts.summary()}")
+        pygame.quit()
+        sys.exit(status)
+        
+    def record_state(self, collected=()):
+        """Record current game state for replay, with the pentagrams collected this frame"""
         if not self.recording:
             return
             
         # Record player state
-        player_pos = (self.player.rect.x, self.player.rect.y)
-        player_vel = (self.player.velocity.x, self.player.velocity.y)
+        rect = self.entities.get(self.player, 'rect')
+        velocity = self.entities.get(self.player, 'velocity')
+        player_pos = (rect.x, rect.y)
+        player_vel = (velocity.x, velocity.y)
         
         # Record enemy states
-        enemy_positions = []
-        enemy_velocities = []
-        for enemy in self.enemies:
-            enemy_positions.append((enemy.rect.x, enemy.rect.y))
-            enemy_velocities.append(enemy.velocity.x)
-            
-        # Record pentagram states
-        pentagram_states = []
-        for pentagram in self.pentagrams:
-            pentagram_states.append(pentagram.collected)
+        enemy_positions = {}
+        enemy_velocities = {}
+        for enemy, rect, velocity, patrol in self.entities.query('rect', 'velocity', 'patrol'):
+            enemy_positions[enemy] = (rect.x, rect.y)
+            enemy_velocities[enemy] = velocity.x
             
         # Create game state and add to replay
-        game_state = GameState(player_pos, player_vel, enemy_positions, enemy_velocities, pentagram_states)
+        game_state = GameState(player_pos, player_vel, enemy_positions, enemy_velocities, tuple(collected))
         self.replay_states.append(game_state)
         
     def start_replay(self):
@@ -499,9 +676,17 @@ class Game:
         self.state = 'replay'
         self.replay_index = 0
         self.replay_speed = 1.0
+        self.rewind_pickups()
         print("Starting replay")
         return True
         
+    def rewind_pickups(self):
+        """Put the pentagrams back the way they were when recording started"""
+        for pentagram, collected in self.replay_start_pickups.items():
+            if self.entities.has(pentagram, 'pickup'):
+                set_collected(self.entities, pentagram, collected)
+        self.replay_pickup_frames = 0
+        
     def update_replay(self):
         """Update game state based on replay data"""
         if self.replay_index >= len(self.replay_states):
@@ -513,19 +698,24 @@ class Game:
         frame = self.replay_states[self.replay_index]
         
         # Update player
-        self.player.rect.x, self.player.rect.y = frame.player_pos
-        self.player.velocity.x, self.player.velocity.y = frame.player_vel
-        
-        # Update enemies
-        for i, enemy in enumerate(self.enemies):
-            if i < len(frame.enemy_positions):
-                enemy.rect.x, enemy.rect.y = frame.enemy_positions[i]
-                enemy.velocity.x = frame.enemy_velocities[i]
+        self.entities.get(self.player, 'rect').topleft = frame.player_pos
+        self.entities.get(self.player, 'velocity').update(frame.player_vel)
+        
+        # Update enemies that still exist
+        for enemy, position in frame.enemy_positions.items():
+            rect = self.entities.get(enemy, 'rect')
+            if rect is not None:
+                rect.topleft = position
+                self.entities.get(enemy, 'velocity').x = frame.enemy_velocities[enemy]
                 
-        # Update pentagrams
-        for i, pentagram in enumerate(self.pentagrams):
-            if i < len(frame.pentagram_states):
-                pentagram.collected = frame.pentagram_states[i]
+        # Update pentagrams, replaying only the frames' pickups since the last update
+        if self.replay_pickup_frames > self.replay_index + 1:
+            self.rewind_pickups()
+        for state in self.replay_states[self.replay_pickup_frames:self.replay_index + 1]:
+            for pentagram in state.collected:
+                if self.entities.has(pentagram, 'pickup'):
+                    set_collected(self.entities, pentagram, True)
+        self.replay_pickup_frames = self.replay_index + 1
                 
         # Advance replay index based on speed
         self.replay_index += int(self.replay_speed)
@@ -535,8 +725,9 @@ class Game:
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
+                
+            self.music.handle_event(event)
                 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -547,15 +738,14 @@ class Game:
                     elif self.state == 'replay':
                         self.state = 'menu'
                     else:
-                        pygame.quit()
-                        sys.exit()
+                        self.quit()
                         
                 if event.key == pygame.K_SPACE:
                     if self.state == 'menu':
                         self.state = 'playing'
-                        self.player = Player()
                         self.current_level = 1
                         self.setup_level(self.current_level)
+                        self.music.play_level(self.current_level)
                         self.start_recording()
                     elif self.state == 'game_over':
                         self.state = 'menu'
@@ -564,14 +754,14 @@ class Game:
                         if self.current_level < self.max_levels:
                             self.current_level += 1
                             self.state = 'playing'
-                            self.player = Player()
                             self.setup_level(self.current_level)
+                            self.music.play_level(self.current_level)
                             self.start_recording()
                         else:
                             # Game completed
                             self.state = 'menu'
                     elif self.state == 'playing':
-                        self.player.jump()
+                        self.jump()
                 
                 # Replay controls
                 if self.state == 'replay':
@@ -601,9 +791,9 @@ class Game:
                         play_button_rect = pygame.Rect(SCREEN_WIDTH/2 - 100, 300, 200, 50)
                         if play_button_rect.collidepoint(mouse_pos):
                             self.state = 'playing'
-                            self.player = Player()
                             self.current_level = 1
                             self.setup_level(self.current_level)
+                            self.music.play_level(self.current_level)
                             self.start_recording()
                             
                         # Check if replay button was clicked (if available)
@@ -615,83 +805,65 @@ class Game:
         # Handle continuous key presses for movement - only in playing state
         keys = pygame.key.get_pressed()
         if self.state == 'playing':
-            self.player.velocity.x = 0
+            velocity = self.entities.get(self.player, 'velocity')
+            velocity.x = 0
             if keys[pygame.K_LEFT]:
-                self.player.velocity.x = -PLAYER_SPEED
+                velocity.x = -PLAYER_SPEED
             if keys[pygame.K_RIGHT]:
-                self.player.velocity.x = PLAYER_SPEED
+                velocity.x = PLAYER_SPEED
+                
+    def jump(self):
+        """Make the player jump if standing on something"""
+        if self.entities.get(self.player, 'body').on_ground:
+            self.entities.get(self.player, 'velocity').y = JUMP_STRENGTH
+            rect = self.entities.get(self.player, 'rect')
+            self.events.emit(JUMP, rect.centerx, rect.bottom, entity=self.player)
                 
     def update(self):
+        self.tick += 1
         if self.state == 'playing':
-            self.player.update(self.platforms)
+            # Move the player, then the enemies
+            gravity_system(self.entities)
+            movement_system(self.entities, self.platforms, self.events)
+            patrol_system(self.entities, self.platforms)
             
-            # Create a copy of enemies list to safely remove during iteration
-            enemies_to_remove = []
-            
-            # Update enemies
-            for enemy in self.enemies:
-                enemy.update(self.platforms)
-                
-                # Check if player jumps on enemy
-                if self.player.rect.colliderect(enemy.rect):
-                    # Improved collision detection for jumping on enemies
-                    # Check if player is falling down and is mostly above the enemy
-                    if (self.player.velocity.y > 0 and 
-                        self.player.rect.bottom < enemy.rect.top + 15 and
-                        self.player.rect.bottom > enemy.rect.top - 10):
-                        # Mark enemy for removal instead of removing immediately
-                        enemies_to_remove.append(enemy)
-                        self.player.velocity.y = JUMP_STRENGTH / 2
-                        self.player.score += 100
-                        # Play enemy defeat sound
-                        if enemy_defeat_sound:
-                            enemy_defeat_sound.play()
-                    else:
-                        # Game over but don't freeze
-                        print("Game over - collision with enemy")
-                        self.state = 'game_over'
-                        # Play game over sound
-                        if game_over_sound:
-                            game_over_sound.play()
-                        if self.recording:
-                            self.stop_recording()
-            
-            # Remove enemies after iteration is complete
-            for enemy in enemies_to_remove:
-                if enemy in self.enemies:
-                    self.enemies.remove(enemy)
+            # Check if player jumps on enemies or runs into one
+            if stomp_system(self.entities, self.player, self.events):
+                # Game over but don't freeze
+                print("Game over - collision with enemy")
+                self.state = 'game_over'
+                rect = self.entities.get(self.player, 'rect')
+                self.events.emit(DEATH, rect.centerx, rect.centery, entity=self.player)
             
             # Check pentagram collisions
-            for pentagram in self.pentagrams:
-                if not pentagram.collected and self.player.rect.colliderect(pentagram.rect):
-                    pentagram.collected = True
-                    self.player.pentagrams += 1
-                    self.player.score += 50
-                    # Play star sound
-                    if star_sound:
-                        star_sound.play()
+            collected = pickup_system(self.entities, self.player, self.events)
                     
             # Check if all pentagrams collected
-            if all(pentagram.collected for pentagram in self.pentagrams) and not self.enemies:
+            if self.entities.count('uncollected') == 0 and self.entities.count('stompable') == 0:
                 self.state = 'win'
-                # Play level complete sound
-                if level_complete_sound:
-                    level_complete_sound.play()
-                self.stop_recording()
+                self.events.emit(LEVEL_COMPLETE, value=self.current_level)
                 
             # Record current state for replay
-            self.record_state()
+            self.record_state(collected)
                 
         elif self.state == 'replay':
             self.update_replay()
+            
+        animation_system(self.entities)
+        
+        # Sound, replay and telemetry react to what happened this step
+        self.events.dispatch()
                 
+    def draw_centered_text(self, text_font, text, y, color=TEXT_COLOR):
+        """Draw a line of text centred horizontally on the screen"""
+        text_font.draw(screen, text, (SCREEN_WIDTH/2 - text_font.size(text)[0]/2, y), color)
+        
     def draw(self):
         screen.fill(SKY_COLOR)
         
         if self.state == 'menu':
             # Draw title
-            title_text = title_font.render('PLATFORM GAME', True, TEXT_COLOR)
-            screen.blit(title_text, (SCREEN_WIDTH/2 - title_text.get_width()/2, 100))
+            self.draw_centered_text(title_font, 'PLATFORM GAME', 100)
             
             # Draw play button
             button_rect = pygame.Rect(SCREEN_WIDTH/2 - 100, 300, 200, 50)
@@ -701,13 +873,10 @@ class Game:
             pygame.draw.rect(screen, TEXT_COLOR, button_rect, 2)
             
             # Button text
-            button_text = font.render('PLAY GAME', True, TEXT_COLOR)
-            screen.blit(button_text, (button_rect.centerx - button_text.get_width()/2, 
-                                     button_rect.centery - button_text.get_height()/2))
+            font.draw_centered(screen, 'PLAY GAME', button_rect.center, TEXT_COLOR)
             
             # Instructions
-            inst_text = font.render('Arrow Keys: Move, Space: Jump', True, TEXT_COLOR)
-            screen.blit(inst_text, (SCREEN_WIDTH/2 - inst_text.get_width()/2, 400))
+            self.draw_centered_text(font, 'Arrow Keys: Move, Space: Jump', 400)
             
             # Replay button (if replay data exists)
             if len(self.replay_states) > 0:
@@ -716,41 +885,30 @@ class Game:
                 pygame.draw.rect(screen, replay_color, replay_rect)
                 pygame.draw.rect(screen, TEXT_COLOR, replay_rect, 2)
                 
-                replay_text = font.render('WATCH REPLAY', True, TEXT_COLOR)
-                screen.blit(replay_text, (replay_rect.centerx - replay_text.get_width()/2, 
-                                         replay_rect.centery - replay_text.get_height()/2))
+                font.draw_centered(screen, 'WATCH REPLAY', replay_rect.center, TEXT_COLOR)
             
         elif self.state == 'playing' or self.state == 'game_over' or self.state == 'win' or self.state == 'replay':
             # Draw platforms
             for platform in self.platforms:
                 pygame.draw.rect(screen, GROUND_COLOR, platform)
                 
-            # Draw pentagrams
-            for pentagram in self.pentagrams:
-                pentagram.draw()
-                
-            # Draw enemies
-            for enemy in self.enemies:
-                enemy.draw()
-                
-            # Draw player
-            self.player.draw()
+            # Draw pentagrams and enemies, then the player on top
+            render_system(self.entities, self.tick, on_top=self.player)
             
             # Draw HUD
-            score_text = font.render(f'Score: {self.player.score}', True, TEXT_COLOR)
-            screen.blit(score_text, (20, 20))
+            stats = self.entities.get(self.player, 'player')
+            font.draw(screen, f'Score: {stats.score}', (20, 20), TEXT_COLOR)
             
-            pentagrams_text = font.render(f'Pentagrams: {self.player.pentagrams}', True, TEXT_COLOR)
-            screen.blit(pentagrams_text, (20, 50))
+            font.draw(screen, f'Pentagrams: {stats.pentagrams}', (20, 50), TEXT_COLOR)
             
             # Replay indicator
             if self.state == 'replay':
-                replay_text = font.render(f'REPLAY {self.replay_index}/{len(self.replay_states)} ({self.replay_speed}x)', True, TEXT_COLOR)
-                screen.blit(replay_text, (SCREEN_WIDTH - replay_text.get_width() - 20, 20))
+                replay_text = f'REPLAY {self.replay_index}/{len(self.replay_states)} ({self.replay_speed}x)'
+                font.draw(screen, replay_text, (SCREEN_WIDTH - font.size(replay_text)[0] - 20, 20), TEXT_COLOR)
                 
                 # Replay controls help
-                controls_text = font.render('R: Restart, Up/Down: Speed, ESC: Exit', True, TEXT_COLOR)
-                screen.blit(controls_text, (SCREEN_WIDTH - controls_text.get_width() - 20, 50))
+                controls_text = 'R: Restart, Up/Down: Speed, ESC: Exit'
+                font.draw(screen, controls_text, (SCREEN_WIDTH - font.size(controls_text)[0] - 20, 50), TEXT_COLOR)
             
             if self.state == 'game_over':
                 # Game over overlay
@@ -759,16 +917,13 @@ class Game:
                 screen.blit(overlay, (0, 0))
                 
                 # Game over text
-                game_over_text = title_font.render('GAME OVER', True, TEXT_COLOR)
-                screen.blit(game_over_text, (SCREEN_WIDTH/2 - game_over_text.get_width()/2, 200))
+                self.draw_centered_text(title_font, 'GAME OVER', 200)
                 
                 # Restart text
-                restart_text = font.render('Press SPACE to continue', True, TEXT_COLOR)
-                screen.blit(restart_text, (SCREEN_WIDTH/2 - restart_text.get_width()/2, 300))
+                self.draw_centered_text(font, 'Press SPACE to continue', 300)
                 
                 # Replay text
-                replay_text = font.render('Press R to watch replay', True, TEXT_COLOR)
-                screen.blit(replay_text, (SCREEN_WIDTH/2 - replay_text.get_width()/2, 340))
+                self.draw_centered_text(font, 'Press R to watch replay', 340)
                 
             if self.state == 'win':
                 # Win overlay
@@ -778,29 +933,27 @@ class Game:
                 
                 # Win text
                 if self.current_level < self.max_levels:
-                    win_text = title_font.render(f'LEVEL {self.current_level} COMPLETE!', True, TEXT_COLOR)
+                    win_text = f'LEVEL {self.current_level} COMPLETE!'
                 else:
-                    win_text = title_font.render('YOU COMPLETED THE GAME!', True, TEXT_COLOR)
-                screen.blit(win_text, (SCREEN_WIDTH/2 - win_text.get_width()/2, 200))
+                    win_text = 'YOU COMPLETED THE GAME!'
+                self.draw_centered_text(title_font, win_text, 200)
                 
                 # Score text
-                final_score_text = font.render(f'Score: {self.player.score}', True, TEXT_COLOR)
-                screen.blit(final_score_text, (SCREEN_WIDTH/2 - final_score_text.get_width()/2, 300))
+                self.draw_centered_text(font, f'Score: {self.entities.get(self.player, "player").score}', 300)
                 
                 # Next level or continue text
                 if self.current_level < self.max_levels:
-                    next_text = font.render('Press SPACE for next level', True, TEXT_COLOR)
+                    next_text = 'Press SPACE for next level'
                 else:
-                    next_text = font.render('Press SPACE to continue', True, TEXT_COLOR)
-                screen.blit(next_text, (SCREEN_WIDTH/2 - next_text.get_width()/2, 350))
+                    next_text = 'Press SPACE to continue'
+                self.draw_centered_text(font, next_text, 350)
                 
                 # Replay text
-                replay_text = font.render('Press R to watch replay', True, TEXT_COLOR)
-                screen.blit(replay_text, (SCREEN_WIDTH/2 - replay_text.get_width()/2, 390))
+                self.draw_centered_text(font, 'Press R to watch replay', 390)
         
         # Debug info
-        debug_text = font.render(f'Game State: {self.state} | Level: {self.current_level}/{self.max_levels}', True, (255, 0, 0))
-        screen.blit(debug_text, (SCREEN_WIDTH - 350, SCREEN_HEIGHT - 30))
+        debug_text = f'Game State: {self.state} | Level: {self.current_level}/{self.max_levels}'
+        font.draw(screen, debug_text, (SCREEN_WIDTH - font.size(debug_text)[0] - 20, SCREEN_HEIGHT - 30), (255, 0, 0))
         
         pygame.display.update()
         
@@ -809,9 +962,15 @@ class Game:
             self.handle_events()
             self.update()
             self.draw()
+            # Cold start ends when the first frame is on screen (no-op afterwards);
+            # in budget check mode, shut down after it with the check's status
+            status = startup_trace.finish()
+            if status is not None:
+                self.quit(status)
             clock.tick(60)
 
 # Run the game
 if __name__ == '__main__':
-    game = Game()
+    with startup_trace.span('Game()'):
+        game = Game()
     game.run()
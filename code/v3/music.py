@@ -0,0 +1,190 @@
+"""
+Streaming background music
+Tracks are streamed from the asset pack (or the assets/ tree) by
+pygame.mixer.music rather than decoded into memory. The next level's track is
+opened ahead of time, and loading it (which parses the file) runs on a
+background thread so no frame waits for it.
+"""
+import os
+import threading
+import pygame
+from asset_pack import open_asset
+
+# Posted by the mixer when the current track ends or finishes fading out
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+
+class MusicPlayer:
+    def __init__(self, tracks, volume=0.4, fade_ms=800, enabled=True):
+        """tracks maps level numbers to music assets; levels without one reuse the closest earlier track
+
+        A player created with enabled=False (or without a mixer) never touches
+        the mixer, so every call on it is a no-op.
+        """
+        self.tracks = tracks
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.enabled = enabled and pygame.mixer.get_init() is not None
+
+        # The file being streamed and the one opened ahead for the next level
+        self.current_path = None
+        self.current_file = None
+        self.next_path = None
+        self.next_file = None
+        # Track to start once the current one has faded out, and the file of the
+        # track fading out, which the mixer reads until the fade ends
+        self.waiting = False
+        self.fading_file = None
+        # Background load of the next track, and its (path, file, error) once done
+        self.loader = None
+        self.loaded = None
+        # Tracks that failed to open or decode, so they are not retried every level
+        self.failed = set()
+
+        if self.enabled:
+            pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+
+    def track_for(self, level):
+        """Music file for a level"""
+        known = [number for number in self.tracks if number <= level]
+        if not known:
+            return None
+        return self.tracks[max(known)]
+
+    def preload(self, level):
+        """Open the level's track ahead of time (e.g. during the win screen)"""
+        path = self.track_for(level)
+        if (not self.enabled or path is None or path in self.failed
+                or path == self.current_path or path == self.next_path):
+            return
+        self._close_next()
+        try:
+            self.next_file = open_asset(path)
+            self.next_path = path
+        except OSError as e:
+            print(f"Error opening music: {path} ({e})")
+            self.failed.add(path)
+
+    def play_level(self, level):
+        """Switch to a level's track, fading the current one out first"""
+        path = self.track_for(level)
+        if not self.enabled or path is None:
+            return
+        self._finish_load(wait=True)
+        if path == self.current_path and pygame.mixer.music.get_busy():
+            # Same track, keep it playing across the level change
+            return
+        self.preload(level)
+        if pygame.mixer.music.get_busy():
+            # SDL streams one music track at a time, so fade out and queue the
+            # next one; the mixer starts it as soon as the fade ends. Queue after
+            # fading, since fadeout() drops anything already queued.
+            self.waiting = True
+            pygame.mixer.music.fadeout(self.fade_ms)
+            self._start_next(queue=True)
+        else:
+            self._start_next(queue=False)
+
+    def handle_event(self, event):
+        """Finish the switch once the previous track has faded out"""
+        if event.type == MUSIC_END_EVENT and self.waiting:
+            path = self._finish_load(wait=True)
+            self.waiting = False
+            self._close_fading()
+            if path is not None and not pygame.mixer.music.get_busy():
+                # The load finished after the fade, too late for the mixer to
+                # pick up the queued track, so start it here
+                try:
+                    self._play(path, self.current_file)
+                except pygame.error as e:
+                    print(f"Error playing music: {path} ({e})")
+                    self.failed.add(path)
+        else:
+            if event.type == MUSIC_END_EVENT:
+                self._close_fading()
+            self._finish_load(wait=False)
+
+    def stop(self):
+        """Fade out the music and close the files that are no longer read"""
+        if not self.enabled:
+            return
+        self._finish_load(wait=True)
+        self.waiting = False
+        pygame.mixer.music.fadeout(self.fade_ms)
+        self._close_next()
+
+    def _start_next(self, queue):
+        """Load the pre-opened track on a background thread
+
+        With queue, the mixer starts it when the current track ends (without a
+        fade-in, which SDL does not offer for queued music); otherwise it starts
+        as soon as it is loaded, fading in.
+        """
+        if self.next_file is None:
+            return
+        path, music_file = self.next_path, self.next_file
+        self.next_path = None
+        self.next_file = None
+        self.loaded = None
+        self.loader = threading.Thread(target=self._load, args=(path, music_file, queue),
+                                       name='music-loader', daemon=True)
+        self.loader.start()
+
+    def _load(self, path, music_file, queue):
+        """Loader thread: parse the track and queue or start it"""
+        try:
+            if queue:
+                pygame.mixer.music.queue(music_file, self._type_hint(path), -1)
+            else:
+                self._play(path, music_file)
+            self.loaded = (path, music_file, None)
+        except pygame.error as e:
+            self.loaded = (path, music_file, e)
+
+    def _finish_load(self, wait):
+        """Take over a finished background load; returns its path if it succeeded"""
+        if self.loader is None or (not wait and self.loader.is_alive()):
+            return None
+        self.loader.join()
+        self.loader = None
+        path, music_file, error = self.loaded
+        if error is not None:
+            print(f"Error playing music: {path} ({error})")
+            self.failed.add(path)
+            music_file.close()
+            return None
+
+        # The mixer reads from the file while streaming, so keep it open until
+        # replaced, and while its track fades out
+        if self.current_file is not None:
+            if self.waiting and self.fading_file is None:
+                self.fading_file = self.current_file
+            else:
+                self.current_file.close()
+        self.current_path = path
+        self.current_file = music_file
+        return path
+
+    def _play(self, path, music_file):
+        """Load and start streaming a track, fading it in"""
+        music_file.seek(0)
+        pygame.mixer.music.load(music_file, self._type_hint(path))
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(-1, fade_ms=self.fade_ms)
+
+    @staticmethod
+    def _type_hint(path):
+        """File type for the mixer, from the extension"""
+        return os.path.splitext(path)[1][1:]
+
+    def _close_fading(self):
+        """Close the file of a track that has finished fading out"""
+        if self.fading_file is not None:
+            self.fading_file.close()
+            self.fading_file = None
+
+    def _close_next(self):
+        """Close a pre-opened track that is no longer needed"""
+        if self.next_file is not None:
+            self.next_file.close()
+        self.next_path = None
+        self.next_file = None
@@ -0,0 +1,65 @@
+"""
+Build tool: pack graphics, audio and fonts into a single asset archive
+Usage: python pack_assets.py [assets_dir] [output]
+The game reads the archive through asset_pack.open_asset().
+"""
+import os
+import sys
+# Modules shared by every version live in the directory above
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from asset_pack import PACK_MAGIC, HEADER, ENTRY, NAME_LENGTH, ALIGNMENT, ASSETS_DIR, PACK_PATH
+
+# Asset folders and file types that go into the archive
+PACKED_DIRS = ('graphics', 'audio', 'fonts')
+PACKED_EXTENSIONS = ('.png', '.wav', '.mp3', '.ogg', '.ttf')
+
+def collect_assets(assets_dir):
+    """Member names (relative, '/'-separated) and paths of every file to pack, sorted"""
+    assets = []
+    for folder in PACKED_DIRS:
+        for root, dirs, files in os.walk(os.path.join(assets_dir, folder)):
+            dirs.sort()
+            for filename in sorted(files):
+                if os.path.splitext(filename)[1].lower() not in PACKED_EXTENSIONS:
+                    continue
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, assets_dir).replace(os.sep, '/')
+                assets.append((name, path))
+    return assets
+
+def pack_assets(assets_dir=ASSETS_DIR, output=PACK_PATH):
+    """Write the archive and return the number of members and total bytes"""
+    assets = collect_assets(assets_dir)
+    toc = []
+    temp_output = output + '.tmp'
+    with open(temp_output, 'wb') as out:
+        out.write(b'\0' * HEADER.size)
+        for name, path in assets:
+            # Align members so they can be read straight out of the mapping
+            padding = -out.tell() % ALIGNMENT
+            out.write(b'\0' * padding)
+            offset = out.tell()
+            with open(path, 'rb') as f:
+                data = f.read()
+            out.write(data)
+            toc.append((name, offset, len(data)))
+
+        toc_offset = out.tell()
+        for name, offset, size in toc:
+            encoded = name.encode('utf-8')
+            out.write(NAME_LENGTH.pack(len(encoded)))
+            out.write(encoded)
+            out.write(ENTRY.pack(offset, size))
+        total = out.tell()
+        out.seek(0)
+        out.write(HEADER.pack(PACK_MAGIC, len(toc), toc_offset))
+
+    # Replace the archive in one step so a running game never sees half of it
+    os.replace(temp_output, output)
+    return len(toc), total
+
+if __name__ == '__main__':
+    assets_dir = sys.argv[1] if len(sys.argv) > 1 else ASSETS_DIR
+    output = sys.argv[2] if len(sys.argv) > 2 else PACK_PATH
+    count, total = pack_assets(assets_dir, output)
+    print(f"Packed {count} assets into {output} ({total // 1024} KiB)")